@@ -1,48 +1,216 @@
+import asyncio
+import heapq
+import logging
 import random
-from fastapi import APIRouter, HTTPException
+import time
+from contextlib import asynccontextmanager
+from itertools import accumulate
+from operator import itemgetter
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import TypeAdapter
 from models import (
     GameConfig, GameSide, CreateGameRequest, UpdateGameRequest,
     OrderResponse, GameWithPrices, BetRequest, OrderBookLevel
 )
-from kalshi_client import get_kalshi_client
-from orderbook import get_orderbook_manager
-from config import get_settings
+from kalshi_client import KalshiClient
+from orderbook import OrderBookManager
+from game_store import get_game_store
+from config import Settings, get_settings
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# orjson encodes the nested orderbook level lists much faster than json.dumps
+router = APIRouter(default_response_class=ORJSONResponse)
 
 # In-memory game storage (replace with DB for production)
-_games: dict[str, GameConfig] = {}
+_games = get_game_store()
+
+
+def get_kalshi_client(request: Request) -> Optional[KalshiClient]:
+    """The app's Kalshi client, created in the lifespan (None in demo mode)."""
+    return request.app.state.kalshi
+
+
+def require_kalshi_client(request: Request) -> KalshiClient:
+    """The app's Kalshi client, for routes with no demo-mode fallback."""
+    client = request.app.state.kalshi
+    if client is None:
+        raise HTTPException(status_code=503, detail="Kalshi API is not connected in demo mode")
+    return client
+
+
+def get_orderbook_manager(request: Request) -> Optional[OrderBookManager]:
+    """The app's orderbook manager, created in the lifespan (None in demo mode)."""
+    return request.app.state.book_manager
+
+
+@asynccontextmanager
+async def _keyed_lock(locks: dict[str, list], key: str):
+    """Hold the lock for key, dropping it once no caller holds or waits on it.
+
+    locks maps key -> [lock, number of holders and waiters].
+    """
+    entry = locks.get(key)
+    if entry is None:
+        entry = locks[key] = [asyncio.Lock(), 0]
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if not entry[1]:
+            del locks[key]
+
+
+# Short-lived market data cache: ticker -> (fetched_at, data)
+_market_cache: dict[str, tuple[float, dict]] = {}
+_market_locks: dict[str, list] = {}
+
+# Resolved opposing-market pairs: ticker -> (resolved_at, response)
+_related_cache: dict[str, tuple[float, dict]] = {}
+_related_locks: dict[str, list] = {}
+# Keyed by tickers from the request path, so bounded
+RELATED_CACHE_MAX = 4096
+
+
+def _prune_related_cache(now: float, ttl: float):
+    """Drop expired entries, then the oldest ones while over RELATED_CACHE_MAX."""
+    for key in [k for k, (resolved_at, _) in _related_cache.items() if now - resolved_at >= ttl]:
+        del _related_cache[key]
+    while len(_related_cache) > RELATED_CACHE_MAX:
+        del _related_cache[next(iter(_related_cache))]
+
+# Serializers for the polled game endpoints, built once. Games with prices are
+# assembled with model_construct from trusted data, so they go straight to JSON
+# bytes instead of through FastAPI's response_model validation.
+_game_json = TypeAdapter(GameWithPrices).dump_json
+_games_json = TypeAdapter(list[GameWithPrices]).dump_json
+
+
+def _json_bytes(content: bytes) -> Response:
+    return Response(content=content, media_type="application/json")
+
+
+_EMPTY_MARKET_DATA = {
+    "yes_asks": [],
+    "yes_ask": None,
+    "yes_bid": None,
+    "no_asks": [],
+    "no_ask": None,
+}
+
+
+_MOCK_DEPTH = 10
+_MOCK_PRICE_STEPS = range(1, 4)
+_MOCK_QUANTITIES = range(5, 151)
 
 
 def _generate_mock_asks(base_price: int) -> list[OrderBookLevel]:
     """Generate realistic-looking mock orderbook asks."""
-    asks = []
-    price = base_price
-    for _ in range(10):
-        asks.append(OrderBookLevel(price=price, quantity=random.randint(5, 150)))
-        price += random.randint(1, 3)
-    return asks
+    # Draw all random values in two calls instead of two per level
+    steps = random.choices(_MOCK_PRICE_STEPS, k=_MOCK_DEPTH - 1)
+    quantities = random.choices(_MOCK_QUANTITIES, k=_MOCK_DEPTH)
+    prices = accumulate(steps, initial=base_price)
+    construct = OrderBookLevel.model_construct
+    return [construct(price=p, quantity=q) for p, q in zip(prices, quantities)]
+
+
+# Demo books only need to look plausible, so a pool of books is generated once
+# at import for every base price the demo can ask for (35-65 Yes, 36-70 No)
+_MOCK_VARIANTS = 8
+_MOCK_ASKS_POOL: dict[int, tuple[list[OrderBookLevel], ...]] = {
+    base: tuple(_generate_mock_asks(base) for _ in range(_MOCK_VARIANTS))
+    for base in range(35, 71)
+}
+
+
+def _mock_asks(base_price: int) -> list[OrderBookLevel]:
+    """Pick a pregenerated mock book for base_price (shared, do not mutate)."""
+    return random.choice(_MOCK_ASKS_POOL[base_price])
 
 
 @router.post("/games", response_model=GameConfig)
-async def create_game(request: CreateGameRequest):
+async def create_game(
+    request: CreateGameRequest,
+    manager: Optional[OrderBookManager] = Depends(get_orderbook_manager),
+):
     game = GameConfig.create(
         name=request.name,
         side_a=request.side_a,
         side_b=request.side_b
     )
-    _games[game.id] = game
+    added, removed = await _games.add(game)
+    if manager is None:  # Demo mode keeps no books
+        return game
 
-    # Subscribe to orderbook updates for both tickers
-    manager = get_orderbook_manager()
-    await manager.subscribe(request.side_a.ticker)
-    await manager.subscribe(request.side_b.ticker)
+    # Subscribe to orderbook updates for tickers not already tracked
+    await manager.subscribe_many(added)
+    # Drop books only referenced by a game evicted to make room
+    for ticker in removed:
+        await manager.unsubscribe(ticker)
 
     return game
 
 
-async def _fetch_market_data(ticker: str) -> dict:
-    """Fetch market and orderbook data from Kalshi API.
+async def _fetch_market_data(ticker: str, manager: OrderBookManager) -> dict:
+    """Fetch market and orderbook data, served from a short TTL cache.
+
+    Concurrent misses for the same ticker share a single upstream fetch.
+    If the upstream fetch fails, the last good value is returned instead.
+    """
+    ttl = get_settings().market_cache_ttl
+    hit = _market_cache.get(ticker)
+    if hit and time.monotonic() - hit[0] < ttl:
+        return hit[1]
+
+    async with _keyed_lock(_market_locks, ticker):
+        # Another request may have refreshed the entry while we waited
+        hit = _market_cache.get(ticker)
+        if hit and time.monotonic() - hit[0] < ttl:
+            return hit[1]
+
+        try:
+            data = await _fetch_market_data_uncached(ticker, manager)
+        except Exception:
+            logger.exception("Error fetching market data for %s", ticker)
+            return hit[1] if hit else dict(_EMPTY_MARKET_DATA)
+
+        _market_cache[ticker] = (time.monotonic(), data)
+        return data
+
+
+def _bids_to_asks(bids_raw: list | None, depth: int) -> list[OrderBookLevel]:
+    """Convert raw [price, qty] bids on one side into the best `depth` asks
+    on the other side.
+
+    Levels come straight from Kalshi as int pairs, so models are built with
+    model_construct to skip per-level validation. The highest bids become
+    the lowest asks, so only the top `depth` bids are selected and converted.
+    """
+    if not bids_raw:  # Handle null
+        return []
+    # One type check on the first level stands in for validating every level;
+    # anything unexpected goes through the validating constructor instead
+    first = bids_raw[0]
+    trusted = len(first) >= 2 and isinstance(first[0], int) and isinstance(first[1], int)
+    construct = OrderBookLevel.model_construct if trusted else OrderBookLevel
+    # nlargest is descending by bid, i.e. ascending by ask (best ask first)
+    try:
+        # Kalshi levels are exact [price, qty] pairs, so skip the per-level shape check
+        return [
+            construct(price=100 - price, quantity=qty)
+            for price, qty in heapq.nlargest(depth, bids_raw, key=itemgetter(0))
+        ]
+    except (IndexError, ValueError):
+        best_bids = heapq.nlargest(depth, (level for level in bids_raw if len(level) >= 2), key=itemgetter(0))
+        return [construct(price=100 - level[0], quantity=level[1]) for level in best_bids]
+
+
+async def _fetch_market_data_uncached(ticker: str, manager: OrderBookManager) -> dict:
+    """Fetch market and orderbook data from the local book or the Kalshi API.
 
     Returns dict with:
       - yes_asks: list of OrderBookLevel for buying Yes
@@ -50,9 +218,21 @@ async def _fetch_market_data(ticker: str) -> dict:
       - yes_bid: best Yes bid price
       - no_asks: list of OrderBookLevel for buying No
       - no_ask: best No ask price (100 - yes_bid)
+
+    Trust boundary: everything past this point is Kalshi data (or our own
+    websocket-fed book), so models built from it skip pydantic validation.
     """
-    client = get_kalshi_client()
-    try:
+    settings = get_settings()
+
+    # Prefer the websocket-fed local book; only go to REST when it's cold or stale
+    orderbook_data = manager.get_orderbook_snapshot(ticker, max_age=settings.orderbook_max_staleness)
+    if orderbook_data is not None:
+        # Local book levels are sorted best first
+        yes_bids, no_bids = orderbook_data["yes"], orderbook_data["no"]
+        best_yes_bid = yes_bids[0][0] if yes_bids else None
+        best_yes_ask = (100 - no_bids[0][0]) if no_bids else None
+    else:
+        client = manager.client
         # Get market data (has best bid/ask)
         market_response = await client.get_market(ticker)
         market = market_response.get("market", market_response)
@@ -60,203 +240,210 @@ async def _fetch_market_data(ticker: str) -> dict:
         best_yes_ask = market.get("yes_ask")  # Already in cents
         best_yes_bid = market.get("yes_bid")  # Already in cents
 
-        # No ask = 100 - Yes bid
-        best_no_ask = (100 - best_yes_bid) if best_yes_bid else None
-
-        # Get orderbook for depth
+        # Get orderbook for depth, and seed the local book with it
         orderbook = await client.get_orderbook(ticker)
-        orderbook_data = orderbook.get("orderbook", {})
-
-        # To BUY Yes, we look at No bids and convert: yes_ask = 100 - no_bid
-        no_bids_raw = orderbook_data.get("no") or []  # Handle null
-        yes_asks = []
-        for level in no_bids_raw:
-            if len(level) >= 2:
-                no_price, qty = level[0], level[1]
-                yes_ask_price = 100 - no_price  # Convert No bid to Yes ask
-                yes_asks.append(OrderBookLevel(price=yes_ask_price, quantity=qty))
-        yes_asks.sort(key=lambda x: x.price)  # Ascending (best ask first)
-
-        # To BUY No, we look at Yes bids and convert: no_ask = 100 - yes_bid
-        yes_bids_raw = orderbook_data.get("yes") or []  # Handle null
-        no_asks = []
-        for level in yes_bids_raw:
-            if len(level) >= 2:
-                yes_price, qty = level[0], level[1]
-                no_ask_price = 100 - yes_price  # Convert Yes bid to No ask
-                no_asks.append(OrderBookLevel(price=no_ask_price, quantity=qty))
-        no_asks.sort(key=lambda x: x.price)  # Ascending (best ask first)
+        orderbook_data = orderbook.get("orderbook") or {}
+        manager.apply_snapshot(ticker, orderbook_data)
+
+    # No ask = 100 - Yes bid
+    best_no_ask = (100 - best_yes_bid) if best_yes_bid else None
+
+    depth = settings.orderbook_depth
+
+    # To BUY Yes, we look at No bids and convert: yes_ask = 100 - no_bid
+    yes_asks = _bids_to_asks(orderbook_data.get("no"), depth)
+
+    # To BUY No, we look at Yes bids and convert: no_ask = 100 - yes_bid
+    no_asks = _bids_to_asks(orderbook_data.get("yes"), depth)
+
+    return {
+        "yes_asks": yes_asks,
+        "yes_ask": best_yes_ask,
+        "yes_bid": best_yes_bid,
+        "no_asks": no_asks,
+        "no_ask": best_no_ask,
+    }
+
+
+def _mock_game_with_prices(game: GameConfig) -> GameWithPrices:
+    """Build a GameWithPrices from randomly generated demo orderbooks."""
+    side_a_base = random.randint(35, 65)
+    side_b_base = random.randint(35, 65)
+    side_a_asks = _mock_asks(side_a_base)
+    side_b_asks = _mock_asks(side_b_base)
+    # No asks = 100 - yes_bid, so generate based on complement
+    side_a_no_asks = _mock_asks(100 - side_a_base + random.randint(1, 5))
+    side_b_no_asks = _mock_asks(100 - side_b_base + random.randint(1, 5))
+
+    return GameWithPrices.model_construct(
+        game=game,
+        side_a_ask=side_a_asks[0].price if side_a_asks else None,
+        side_a_bid=side_a_base - random.randint(1, 3),
+        side_b_ask=side_b_asks[0].price if side_b_asks else None,
+        side_b_bid=side_b_base - random.randint(1, 3),
+        side_a_asks=side_a_asks,
+        side_b_asks=side_b_asks,
+        # Each team's own No market
+        side_a_no_ask=side_a_no_asks[0].price if side_a_no_asks else None,
+        side_a_no_asks=side_a_no_asks,
+        side_b_no_ask=side_b_no_asks[0].price if side_b_no_asks else None,
+        side_b_no_asks=side_b_no_asks,
+    )
 
-        return {
-            "yes_asks": yes_asks,
-            "yes_ask": best_yes_ask,
-            "yes_bid": best_yes_bid,
-            "no_asks": no_asks,
-            "no_ask": best_no_ask,
-        }
-    except Exception as e:
-        print(f"Error fetching market data for {ticker}: {e}")
-        return {
-            "yes_asks": [],
-            "yes_ask": None,
-            "yes_bid": None,
-            "no_asks": [],
-            "no_ask": None,
-        }
 
+def _game_with_prices(game: GameConfig, side_a_data: dict, side_b_data: dict) -> GameWithPrices:
+    """Build a GameWithPrices from two _fetch_market_data results."""
+    # Each team shows its OWN Yes and No markets directly. Every input is
+    # already a model or a plain number, so skip re-validating the nested lists
+    return GameWithPrices.model_construct(
+        game=game,
+        side_a_ask=side_a_data["yes_ask"],
+        side_a_bid=side_a_data["yes_bid"],
+        side_b_ask=side_b_data["yes_ask"],
+        side_b_bid=side_b_data["yes_bid"],
+        side_a_asks=side_a_data["yes_asks"],
+        side_b_asks=side_b_data["yes_asks"],
+        # Team A's own No market
+        side_a_no_ask=side_a_data["no_ask"],
+        side_a_no_asks=side_a_data["no_asks"],
+        # Team B's own No market
+        side_b_no_ask=side_b_data["no_ask"],
+        side_b_no_asks=side_b_data["no_asks"],
+    )
 
-@router.get("/games", response_model=list[GameWithPrices])
-async def list_games():
-    settings = get_settings()
-    result = []
-
-    for game in _games.values():
-        if settings.demo_mode:
-            # Generate mock orderbook data
-            side_a_base = random.randint(35, 65)
-            side_b_base = random.randint(35, 65)
-            side_a_asks = _generate_mock_asks(side_a_base)
-            side_b_asks = _generate_mock_asks(side_b_base)
-            # No asks = 100 - yes_bid, so generate based on complement
-            side_a_no_asks = _generate_mock_asks(100 - side_a_base + random.randint(1, 5))
-            side_b_no_asks = _generate_mock_asks(100 - side_b_base + random.randint(1, 5))
-
-            result.append(GameWithPrices(
-                game=game,
-                side_a_ask=side_a_asks[0].price if side_a_asks else None,
-                side_a_bid=side_a_base - random.randint(1, 3),
-                side_b_ask=side_b_asks[0].price if side_b_asks else None,
-                side_b_bid=side_b_base - random.randint(1, 3),
-                side_a_asks=side_a_asks,
-                side_b_asks=side_b_asks,
-                # Each team's own No market
-                side_a_no_ask=side_a_no_asks[0].price if side_a_no_asks else None,
-                side_a_no_asks=side_a_no_asks,
-                side_b_no_ask=side_b_no_asks[0].price if side_b_no_asks else None,
-                side_b_no_asks=side_b_no_asks,
-            ))
-        else:
-            # Fetch orderbook data directly from Kalshi API
-            side_a_data = await _fetch_market_data(game.side_a.ticker)
-            side_b_data = await _fetch_market_data(game.side_b.ticker)
-
-            # Each team shows its OWN Yes and No markets directly
-            result.append(GameWithPrices(
-                game=game,
-                side_a_ask=side_a_data["yes_ask"],
-                side_a_bid=side_a_data["yes_bid"],
-                side_b_ask=side_b_data["yes_ask"],
-                side_b_bid=side_b_data["yes_bid"],
-                side_a_asks=side_a_data["yes_asks"],
-                side_b_asks=side_b_data["yes_asks"],
-                # Team A's own No market
-                side_a_no_ask=side_a_data["no_ask"],
-                side_a_no_asks=side_a_data["no_asks"],
-                # Team B's own No market
-                side_b_no_ask=side_b_data["no_ask"],
-                side_b_no_asks=side_b_data["no_asks"],
-            ))
-
-    return result
-
-
-@router.get("/games/{game_id}", response_model=GameWithPrices)
-async def get_game(game_id: str):
-    if game_id not in _games:
-        raise HTTPException(status_code=404, detail="Game not found")
 
-    game = _games[game_id]
-    settings = get_settings()
+async def _build_game_with_prices(
+    game: GameConfig, settings: Settings, manager: Optional[OrderBookManager]
+) -> GameWithPrices:
+    if settings.demo_mode:
+        return _mock_game_with_prices(game)
 
+    # Fetch orderbook data directly from Kalshi API
+    side_a_data, side_b_data = await asyncio.gather(
+        _fetch_market_data(game.side_a.ticker, manager),
+        _fetch_market_data(game.side_b.ticker, manager),
+    )
+    return _game_with_prices(game, side_a_data, side_b_data)
+
+
+@router.get("/games", response_class=Response, responses={200: {"model": list[GameWithPrices]}})
+async def list_games(
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    settings: Settings = Depends(get_settings),
+    manager: Optional[OrderBookManager] = Depends(get_orderbook_manager),
+):
+    """List games with prices. Pass the last game id as `cursor` to get the next `limit` games."""
+    paginated = limit is not None or cursor is not None
+    # Snapshot before awaiting so games added mid-fetch can't miss their data
+    try:
+        games = _games.page(cursor, limit) if paginated else list(_games.values())
+    except KeyError:
+        raise HTTPException(status_code=410, detail="Cursor game no longer exists; restart from the first page")
     if settings.demo_mode:
-        side_a_base = random.randint(35, 65)
-        side_b_base = random.randint(35, 65)
-        side_a_asks = _generate_mock_asks(side_a_base)
-        side_b_asks = _generate_mock_asks(side_b_base)
-        # No asks = 100 - yes_bid, so generate based on complement
-        side_a_no_asks = _generate_mock_asks(100 - side_a_base + random.randint(1, 5))
-        side_b_no_asks = _generate_mock_asks(100 - side_b_base + random.randint(1, 5))
-
-        return GameWithPrices(
-            game=game,
-            side_a_ask=side_a_asks[0].price if side_a_asks else None,
-            side_a_bid=side_a_base - random.randint(1, 3),
-            side_b_ask=side_b_asks[0].price if side_b_asks else None,
-            side_b_bid=side_b_base - random.randint(1, 3),
-            side_a_asks=side_a_asks,
-            side_b_asks=side_b_asks,
-            # Each team's own No market
-            side_a_no_ask=side_a_no_asks[0].price if side_a_no_asks else None,
-            side_a_no_asks=side_a_no_asks,
-            side_b_no_ask=side_b_no_asks[0].price if side_b_no_asks else None,
-            side_b_no_asks=side_b_no_asks,
-        )
+        return _json_bytes(_games_json([_mock_game_with_prices(game) for game in games]))
+
+    # Fetch every unique ticker concurrently instead of 2 round-trips per game
+    if paginated:
+        tickers = list({t for g in games for t in (g.side_a.ticker, g.side_b.ticker)})
     else:
-        # Fetch orderbook data directly from Kalshi API
-        side_a_data = await _fetch_market_data(game.side_a.ticker)
-        side_b_data = await _fetch_market_data(game.side_b.ticker)
-
-        # Each team shows its OWN Yes and No markets directly
-        return GameWithPrices(
-            game=game,
-            side_a_ask=side_a_data["yes_ask"],
-            side_a_bid=side_a_data["yes_bid"],
-            side_b_ask=side_b_data["yes_ask"],
-            side_b_bid=side_b_data["yes_bid"],
-            side_a_asks=side_a_data["yes_asks"],
-            side_b_asks=side_b_data["yes_asks"],
-            # Team A's own No market
-            side_a_no_ask=side_a_data["no_ask"],
-            side_a_no_asks=side_a_data["no_asks"],
-            # Team B's own No market
-            side_b_no_ask=side_b_data["no_ask"],
-            side_b_no_asks=side_b_data["no_asks"],
-        )
+        tickers = list(_games.tickers())
+    results = await asyncio.gather(*(_fetch_market_data(t, manager) for t in tickers))
+    data_by_ticker = dict(zip(tickers, results))
 
+    return _json_bytes(_games_json([
+        _game_with_prices(game, data_by_ticker[game.side_a.ticker], data_by_ticker[game.side_b.ticker])
+        for game in games
+    ]))
 
-@router.put("/games/{game_id}", response_model=GameConfig)
-async def update_game(game_id: str, request: UpdateGameRequest):
-    if game_id not in _games:
+
+@router.get("/games/stream")
+async def stream_games(
+    settings: Settings = Depends(get_settings),
+    manager: Optional[OrderBookManager] = Depends(get_orderbook_manager),
+):
+    """Stream games as NDJSON, one line per game as soon as its prices resolve."""
+    tasks = [asyncio.create_task(_build_game_with_prices(g, settings, manager)) for g in _games.values()]
+
+    async def gen():
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                game_with_prices = await next_done
+                yield _game_json(game_with_prices) + b"\n"
+        finally:
+            # Client disconnected early - don't leave fetches running
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(gen(), media_type="application/x-ndjson")
+
+
+@router.get("/games/{game_id}", response_class=Response, responses={200: {"model": GameWithPrices}})
+async def get_game(
+    game_id: str,
+    settings: Settings = Depends(get_settings),
+    manager: Optional[OrderBookManager] = Depends(get_orderbook_manager),
+):
+    game = _games.get(game_id)
+    if game is None:
         raise HTTPException(status_code=404, detail="Game not found")
 
-    game = _games[game_id]
+    return _json_bytes(_game_json(await _build_game_with_prices(game, settings, manager)))
 
-    if request.name:
-        game.name = request.name
-    if request.side_a:
-        game.side_a = request.side_a
-        manager = get_orderbook_manager()
-        await manager.subscribe(request.side_a.ticker)
-    if request.side_b:
-        game.side_b = request.side_b
-        manager = get_orderbook_manager()
-        await manager.subscribe(request.side_b.ticker)
+
+@router.put("/games/{game_id}", response_model=GameConfig)
+async def update_game(
+    game_id: str,
+    request: UpdateGameRequest,
+    manager: Optional[OrderBookManager] = Depends(get_orderbook_manager),
+):
+    game, added, removed = await _games.update(
+        game_id, name=request.name, side_a=request.side_a, side_b=request.side_b
+    )
+    if game is None:
+        raise HTTPException(status_code=404, detail="Game not found")
+    if manager is None:
+        return game
+
+    await manager.subscribe_many(added)
+    for ticker in removed:
+        await manager.unsubscribe(ticker)
 
     return game
 
 
 @router.delete("/games/{game_id}")
-async def delete_game(game_id: str):
-    if game_id not in _games:
+async def delete_game(game_id: str, manager: Optional[OrderBookManager] = Depends(get_orderbook_manager)):
+    removed = await _games.remove(game_id)
+    if removed is None:
         raise HTTPException(status_code=404, detail="Game not found")
 
-    del _games[game_id]
+    if manager is not None:
+        for ticker in removed:
+            await manager.unsubscribe(ticker)
+
     return {"status": "deleted"}
 
 
 @router.post("/games/{game_id}/bet/{side}", response_model=OrderResponse)
-async def place_bet(game_id: str, side: str, request: BetRequest = None):
+async def place_bet(
+    game_id: str,
+    side: str,
+    request: BetRequest = None,
+    settings: Settings = Depends(get_settings),
+    client: Optional[KalshiClient] = Depends(get_kalshi_client),
+):
     """
     Execute a bet on side 'a' or 'b'.
     bet_type can be 'yes' or 'no' (defaults to 'yes').
     """
-    if game_id not in _games:
+    game = _games.get(game_id)
+    if game is None:
         raise HTTPException(status_code=404, detail="Game not found")
 
     if side not in ("a", "b"):
         raise HTTPException(status_code=400, detail="Side must be 'a' or 'b'")
 
-    game = _games[game_id]
     game_side: GameSide = game.side_a if side == "a" else game.side_b
 
     # Use request params if provided, otherwise use preset
@@ -267,8 +454,6 @@ async def place_bet(game_id: str, side: str, request: BetRequest = None):
     if bet_type not in ("yes", "no"):
         raise HTTPException(status_code=400, detail="bet_type must be 'yes' or 'no'")
 
-    settings = get_settings()
-
     if settings.demo_mode:
         # Return mock order response
         import uuid
@@ -281,8 +466,6 @@ async def place_bet(game_id: str, side: str, request: BetRequest = None):
             status="filled"
         )
 
-    client = get_kalshi_client()
-
     try:
         result = await client.place_order(
             ticker=game_side.ticker,
@@ -307,9 +490,8 @@ async def place_bet(game_id: str, side: str, request: BetRequest = None):
 
 
 @router.get("/markets/search")
-async def search_markets(query: str):
+async def search_markets(query: str, client: KalshiClient = Depends(require_kalshi_client)):
     """Search for markets matching a query."""
-    client = get_kalshi_client()
     try:
         result = await client.search_markets(query)
         return result
@@ -318,13 +500,15 @@ async def search_markets(query: str):
 
 
 @router.get("/debug/market/{ticker}")
-async def debug_market(ticker: str):
+async def debug_market(
+    ticker: str,
+    settings: Settings = Depends(get_settings),
+    client: Optional[KalshiClient] = Depends(get_kalshi_client),
+):
     """Debug endpoint - returns raw market data from Kalshi."""
-    settings = get_settings()
     if settings.demo_mode:
         return {"error": "Debug only works with real API"}
 
-    client = get_kalshi_client()
     try:
         market = await client.get_market(ticker)
         return {"raw_market": market}
@@ -333,13 +517,15 @@ async def debug_market(ticker: str):
 
 
 @router.get("/debug/orderbook/{ticker}")
-async def debug_orderbook(ticker: str):
+async def debug_orderbook(
+    ticker: str,
+    settings: Settings = Depends(get_settings),
+    client: Optional[KalshiClient] = Depends(get_kalshi_client),
+):
     """Debug endpoint - returns raw orderbook data from Kalshi."""
-    settings = get_settings()
     if settings.demo_mode:
         return {"error": "Debug only works with real API"}
 
-    client = get_kalshi_client()
     try:
         orderbook = await client.get_orderbook(ticker)
         return {"raw_orderbook": orderbook}
@@ -348,12 +534,15 @@ async def debug_orderbook(ticker: str):
 
 
 @router.get("/markets/{ticker}/related")
-async def get_related_market(ticker: str):
+async def get_related_market(
+    ticker: str,
+    settings: Settings = Depends(get_settings),
+    client: Optional[KalshiClient] = Depends(get_kalshi_client),
+):
     """
     Given a ticker, find the related opposing market.
     Returns both sides with team names auto-populated.
     """
-    settings = get_settings()
 
     if settings.demo_mode:
         # Generate mock related market based on ticker
@@ -382,72 +571,98 @@ async def get_related_market(ticker: str):
             }
         }
 
-    client = get_kalshi_client()
-    try:
-        ticker_upper = ticker.upper()
+    ticker_upper = ticker.upper()
+    ttl = settings.related_cache_ttl
+    hit = _related_cache.get(ticker_upper)
+    if hit and time.monotonic() - hit[0] < ttl:
+        return hit[1]
+
+    async with _keyed_lock(_related_locks, ticker_upper):
+        hit = _related_cache.get(ticker_upper)
+        if hit and time.monotonic() - hit[0] < ttl:
+            return hit[1]
+
+        try:
+            related = await _resolve_related_market(client, ticker_upper)
+        except Exception as e:
+            logger.exception("Error in get_related_market for %s", ticker_upper)
+            raise HTTPException(status_code=500, detail=str(e))
+
+        now = time.monotonic()
+        _related_cache[ticker_upper] = (now, related)
+        # The opposing market resolves to the same pairing with sides swapped
+        side_b = related["side_b"]
+        if side_b and side_b["ticker"] and side_b["ticker"] != ticker_upper:
+            _related_cache.setdefault(side_b["ticker"], (now, {
+                "event_name": related["event_name"],
+                "side_a": side_b,
+                "side_b": related["side_a"],
+            }))
+        if len(_related_cache) > RELATED_CACHE_MAX:
+            _prune_related_cache(now, ttl)
+        return related
+
+
+async def _resolve_related_market(client: KalshiClient, ticker_upper: str) -> dict:
+    """Look up the opposing market for a ticker via the Kalshi API."""
+    # First, try to get markets for this as an event ticker
+    event_response = await client.get_event_markets(ticker_upper)
+    markets = event_response.get("markets", [])
+
+    if len(markets) >= 2:
+        # Found multiple markets - this was an event ticker
+        # Sort by ticker to get consistent ordering
+        markets.sort(key=lambda m: m.get("ticker", ""))
+        market_a = markets[0]
+        market_b = markets[1]
 
-        # First, try to get markets for this as an event ticker
-        event_response = await client.get_event_markets(ticker_upper)
-        markets = event_response.get("markets", [])
+        return {
+            "event_name": market_a.get("title", ticker_upper),
+            "side_a": {
+                "ticker": market_a.get("ticker"),
+                "team_name": market_a.get("yes_sub_title") or market_a.get("subtitle") or "Team A",
+            },
+            "side_b": {
+                "ticker": market_b.get("ticker"),
+                "team_name": market_b.get("yes_sub_title") or market_b.get("subtitle") or "Team B",
+            }
+        }
+
+    # Try as a market ticker instead
+    response = await client.get_market(ticker_upper)
+    market = response.get("market", response)
+    event_ticker = market.get("event_ticker", "")
+    yes_sub_title = market.get("yes_sub_title", "")
 
-        if len(markets) >= 2:
-            # Found multiple markets - this was an event ticker
-            # Sort by ticker to get consistent ordering
-            markets.sort(key=lambda m: m.get("ticker", ""))
-            market_a = markets[0]
-            market_b = markets[1]
+    # Get other markets in the same event
+    if event_ticker:
+        event_response = await client.get_event_markets(event_ticker)
+        markets = event_response.get("markets", [])
+        other_markets = [m for m in markets if m.get("ticker") != ticker_upper]
 
+        if other_markets:
+            other = other_markets[0]
             return {
-                "event_name": market_a.get("title", ticker_upper),
+                "event_name": market.get("title", event_ticker),
                 "side_a": {
-                    "ticker": market_a.get("ticker"),
-                    "team_name": market_a.get("yes_sub_title") or market_a.get("subtitle") or "Team A",
+                    "ticker": ticker_upper,
+                    "team_name": yes_sub_title or "Team A",
                 },
                 "side_b": {
-                    "ticker": market_b.get("ticker"),
-                    "team_name": market_b.get("yes_sub_title") or market_b.get("subtitle") or "Team B",
+                    "ticker": other.get("ticker"),
+                    "team_name": other.get("yes_sub_title") or "Team B",
                 }
             }
 
-        # Try as a market ticker instead
-        response = await client.get_market(ticker_upper)
-        market = response.get("market", response)
-        event_ticker = market.get("event_ticker", "")
-        yes_sub_title = market.get("yes_sub_title", "")
-
-        # Get other markets in the same event
-        if event_ticker:
-            event_response = await client.get_event_markets(event_ticker)
-            markets = event_response.get("markets", [])
-            other_markets = [m for m in markets if m.get("ticker") != ticker_upper]
-
-            if other_markets:
-                other = other_markets[0]
-                return {
-                    "event_name": market.get("title", event_ticker),
-                    "side_a": {
-                        "ticker": ticker_upper,
-                        "team_name": yes_sub_title or "Team A",
-                    },
-                    "side_b": {
-                        "ticker": other.get("ticker"),
-                        "team_name": other.get("yes_sub_title") or "Team B",
-                    }
-                }
-
-        # Fallback: single market
-        return {
-            "event_name": market.get("title", ticker_upper),
-            "side_a": {
-                "ticker": ticker_upper,
-                "team_name": yes_sub_title or "Yes",
-            },
-            "side_b": None
-        }
-
-    except Exception as e:
-        print(f"Error in get_related_market: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    # Fallback: single market
+    return {
+        "event_name": market.get("title", ticker_upper),
+        "side_a": {
+            "ticker": ticker_upper,
+            "team_name": yes_sub_title or "Yes",
+        },
+        "side_b": None
+    }
 
 
 @router.get("/events")
@@ -455,10 +670,11 @@ async def get_events(
     category: str = None,
     search: str = None,
     limit: int = 50,
-    series_ticker: str = None
+    series_ticker: str = None,
+    settings: Settings = Depends(get_settings),
+    client: KalshiClient = Depends(require_kalshi_client),
 ):
     """Get events from Kalshi API."""
-    client = get_kalshi_client()
     try:
         # If series_ticker provided, query markets directly and group by event
         if series_ticker:
@@ -491,16 +707,22 @@ async def get_events(
             if category:
                 events = [e for e in events if e.get("category", "").lower() == category.lower()]
 
-            # For each event, get its markets
-            for event in events[:limit]:
+            # For each event, get its markets (concurrently, bounded to avoid hammering Kalshi)
+            fanout = asyncio.Semaphore(settings.kalshi_fanout)
+
+            async def _attach_markets(event: dict):
                 event_ticker = event.get("event_ticker", "")
                 try:
-                    markets_result = await client._request("GET", f"/markets?event_ticker={event_ticker}")
+                    async with fanout:
+                        markets_result = await client._request("GET", f"/markets?event_ticker={event_ticker}")
                     event["markets"] = markets_result.get("markets", [])
-                except:
+                except Exception:
+                    logger.exception("Error fetching markets for event %s", event_ticker)
                     event["markets"] = []
                 event["ticker"] = event_ticker
 
+            await asyncio.gather(*(_attach_markets(event) for event in events[:limit]))
+
         # Filter by search if specified
         if search:
             search_lower = search.lower()
@@ -508,23 +730,20 @@ async def get_events(
 
         return {"events": events[:limit]}
     except Exception as e:
-        print(f"Error fetching events: {e}")
+        logger.exception("Error fetching events")
         return {"events": [], "error": str(e)}
 
 
 @router.get("/positions")
-async def get_positions():
-    client = get_kalshi_client()
+async def get_positions(client: KalshiClient = Depends(require_kalshi_client)):
     return await client.get_positions()
 
 
 @router.get("/balance")
-async def get_balance():
-    client = get_kalshi_client()
+async def get_balance(client: KalshiClient = Depends(require_kalshi_client)):
     return await client.get_balance()
 
 
 @router.delete("/order/{order_id}")
-async def cancel_order(order_id: str):
-    client = get_kalshi_client()
+async def cancel_order(order_id: str, client: KalshiClient = Depends(require_kalshi_client)):
     return await client.cancel_order(order_id)
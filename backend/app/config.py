@@ -0,0 +1,20 @@
+from functools import lru_cache
+
+from pydantic_settings import BaseSettings
+
+
+class Settings(BaseSettings):
+    api_key_id: str = ""
+    private_key_pem: str = ""
+    kalshi_api_base: str = "https://api.elections.kalshi.com/trade-api/v2"
+    kalshi_ws_url: str = "wss://api.elections.kalshi.com/trade-api/ws/v2"
+    demo_mode: str = "false"
+    kalshi_env: str = "prod"
+    cors_origins: str = "http://localhost:3000"  # Comma-separated frontend origins
+
+    model_config = {"env_file": ".env", "extra": "ignore"}
+
+
+@lru_cache()
+def get_settings() -> Settings:
+    return Settings()
@@ -1,100 +1,222 @@
 """FastAPI backend for Kalshi Trading Dashboard."""
 
+import asyncio
 import base64
+import heapq
+import re
 import time
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from operator import itemgetter
 from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+from functools import partial
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from pydantic_settings import BaseSettings
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import padding
-from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
 import httpx
+import orjson
+import websockets
 
+from .config import get_settings
 
-class Settings(BaseSettings):
-    api_key_id: str = ""
-    private_key_pem: str = ""
-    kalshi_api_base: str = "https://api.elections.kalshi.com/trade-api/v2"
-    demo_mode: str = "false"
-    kalshi_env: str = "prod"
-
-    model_config = {"env_file": ".env", "extra": "ignore"}
 
+settings = get_settings()
 
-settings = Settings()
+# Signing constants, built once instead of per request
+_SHA256 = hashes.SHA256()
+_PSS = padding.PSS(mgf=padding.MGF1(_SHA256), salt_length=padding.PSS.MAX_LENGTH)
+_B64 = base64.b64encode
+# The only HTTP methods the client sends, pre-encoded for the signed message
+_METHOD_BYTES = {m: m.encode() for m in ("GET", "POST", "PUT", "DELETE")}
 
 
 class KalshiClient:
     def __init__(self):
         self.base_url = settings.kalshi_api_base
         self._private_key = None
-        self._client = None
-
-    @property
-    def private_key(self):
-        if self._private_key is None:
+        self._is_ed25519 = False
+        self._sign_prefix = b"/trade-api/v2"  # Prepended to REST paths in the signed message
+        self._base_headers = {
+            "KALSHI-ACCESS-KEY": settings.api_key_id,
+            "Content-Type": "application/json",
+            # Large /markets pages compress well; httpx decodes br via the brotli package
+            "Accept-Encoding": "gzip, br",
+        }
+        self.client: Optional[httpx.AsyncClient] = None
+        # Signatures for the current millisecond: (method, path, ts) -> signature,
+        # or the pending future while an RSA sign runs on the pool.
+        # Concurrent requests to the same path in the same ms share one sign.
+        self._sig_cache: dict[tuple[str, str, int], str | asyncio.Future] = {}
+        self._sign_pool: Optional[ThreadPoolExecutor] = None
+        self._sig_cache_ts = 0
+        # In-flight GETs: (path, params) -> task, for coalescing duplicates
+        self._inflight: dict[tuple, asyncio.Task] = {}
+
+    def open(self):
+        """Load the signing key and create the pooled HTTP/2 client.
+
+        Called from lifespan so the client binds to the running loop.
+        """
+        if settings.private_key_pem:
             key_pem = settings.private_key_pem.replace("\\n", "\n").encode()
-            self._private_key = serialization.load_pem_private_key(key_pem, password=None, backend=default_backend())
-        return self._private_key
-
-    @property
-    def client(self):
-        if self._client is None:
-            self._client = httpx.AsyncClient(timeout=30.0)
-        return self._client
-
-    def _sign(self, method: str, path: str, timestamp: int) -> str:
-        message = f"{timestamp}{method}{path}".encode('utf-8')
-        signature = self.private_key.sign(
-            message,
-            padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH),
-            hashes.SHA256()
+            self._private_key = serialization.load_pem_private_key(key_pem, password=None)
+            # PRIVATE_KEY_PEM may hold an Ed25519 key instead of RSA; it signs much faster
+            self._is_ed25519 = isinstance(self._private_key, Ed25519PrivateKey)
+            if not self._is_ed25519:
+                self._sign_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="kalshi-sign")
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self._base_headers,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            # One upstream host: HTTP/2 multiplexes, so a small pool that stays warm is enough
+            limits=httpx.Limits(max_keepalive_connections=50, max_connections=50, keepalive_expiry=60.0),
+            http2=True,
         )
-        return base64.b64encode(signature).decode('utf-8')
 
-    def _headers(self, method: str, path: str) -> dict:
-        ts = int(time.time() * 1000)
-        sign_path = f"/trade-api/v2{path}"
-        return {
-            "KALSHI-ACCESS-KEY": settings.api_key_id,
-            "KALSHI-ACCESS-SIGNATURE": self._sign(method, sign_path, ts),
-            "KALSHI-ACCESS-TIMESTAMP": str(ts),
-            "Content-Type": "application/json"
-        }
+    def _sign(self, method: str, path: str, timestamp: int, prefix: bytes = b"") -> str:
+        # Build the signed message as bytes directly rather than format-then-encode
+        message = b"%d%s%s%s" % (timestamp, _METHOD_BYTES.get(method) or method.encode(), prefix, path.encode())
+        if self._is_ed25519:
+            signature = self._private_key.sign(message)
+        else:
+            signature = self._private_key.sign(message, _PSS, _SHA256)
+        return _B64(signature).decode("ascii")
+
+    async def _headers(self, method: str, path: str) -> dict:
+        ts = time.time_ns() // 1_000_000
+        if ts != self._sig_cache_ts:
+            # Older timestamps can never be requested again, so drop them all
+            self._sig_cache.clear()
+            self._sig_cache_ts = ts
+        key = (method, path, ts)
+        signature = self._sig_cache.get(key)
+        if signature is None:
+            if self._is_ed25519:
+                # Ed25519 signs in microseconds; a thread hop would cost more than it saves
+                signature = self._sign(method, path, ts, self._sign_prefix)
+            else:
+                # RSA-PSS takes on the order of a millisecond, so sign on the pool and keep
+                # the loop serving I/O. Same-key requests await this same future.
+                signature = asyncio.get_running_loop().run_in_executor(
+                    self._sign_pool, self._sign, method, path, ts, self._sign_prefix
+                )
+            self._sig_cache[key] = signature
+        if not isinstance(signature, str):
+            # Shielded: one cancelled waiter mustn't cancel the future the others share
+            signature = await asyncio.shield(signature)
+        # Static headers live on the AsyncClient; only the signed pair varies per request
+        return {"KALSHI-ACCESS-SIGNATURE": signature, "KALSHI-ACCESS-TIMESTAMP": str(ts)}
+
+    def ws_headers(self) -> list[tuple[str, str]]:
+        """Auth headers for the WebSocket upgrade, signed over the ws path."""
+        ts = time.time_ns() // 1_000_000
+        return [
+            ("KALSHI-ACCESS-KEY", settings.api_key_id),
+            ("KALSHI-ACCESS-SIGNATURE", self._sign("GET", "/trade-api/ws/v2", ts)),
+            ("KALSHI-ACCESS-TIMESTAMP", str(ts)),
+        ]
 
     async def request(self, method: str, path: str, params=None, json_data=None):
-        headers = self._headers(method.upper(), path)
-        url = f"{self.base_url}{path}"
-        resp = await self.client.request(method, url, headers=headers, params=params, json=json_data)
+        """Send a signed request and return the decoded JSON.
+
+        Concurrent identical GETs share one upstream request, so their
+        callers receive the same payload object.
+        """
+        method = method.upper()
+        if method != "GET":
+            return await self._send(method, path, params, json_data)
+
+        key = (path, frozenset(params.items()) if params else None)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._send(method, path, params, None))
+            self._inflight[key] = task
+
+            def _done(t: asyncio.Task):
+                self._inflight.pop(key, None)
+                if not t.cancelled():
+                    t.exception()  # Mark retrieved even if every waiter went away
+
+            task.add_done_callback(_done)
+        # Shield so one caller being cancelled doesn't fail the others
+        return await asyncio.shield(task)
+
+    async def _send(self, method: str, path: str, params, json_data):
+        headers = await self._headers(method, path)
+        # Encode bodies with orjson too; Content-Type is already a client default header
+        content = orjson.dumps(json_data) if json_data is not None else None
+        resp = await self.client.request(method, path, headers=headers, params=params, content=content)
         resp.raise_for_status()
-        return resp.json()
+        return orjson.loads(resp.content)
 
     async def close(self):
-        if self._client:
-            await self._client.aclose()
+        if self.client:
+            await self.client.aclose()
+        if self._sign_pool:
+            self._sign_pool.shutdown(wait=False)
 
 
 client = KalshiClient()
 
 
+# Read-only Kalshi responses that change on the order of minutes:
+# (path, params) -> (expires_at, payload). Payloads are shared; don't mutate them.
+_get_cache: dict[tuple, tuple[float, dict]] = {}
+
+SERIES_TTL = 300.0
+SERIES_MARKETS_TTL = 60.0
+EVENT_TTL = 300.0
+MARKET_TTL = 60.0
+DETAIL_TTL = 5.0  # Event/market detail pages; matches their Cache-Control max-age
+GET_CACHE_MAX = 4096
+
+
+def _prune_get_cache(now: float):
+    """Drop expired entries, then the oldest ones if still over GET_CACHE_MAX."""
+    for key in [k for k, (expires_at, _) in _get_cache.items() if expires_at <= now]:
+        del _get_cache[key]
+    while len(_get_cache) >= GET_CACHE_MAX:
+        del _get_cache[next(iter(_get_cache))]
+
+
+async def cached_get(path: str, params: Optional[dict] = None, ttl: float = 60.0) -> dict:
+    """GET through the client, reusing a response younger than ttl seconds."""
+    key = (path, frozenset(params.items()) if params else None)
+    now = time.monotonic()
+    hit = _get_cache.get(key)
+    if hit and hit[0] > now:
+        return hit[1]
+    payload = await client.request("GET", path, params=params)
+    if len(_get_cache) >= GET_CACHE_MAX:
+        _prune_get_cache(now)
+    _get_cache[key] = (now + ttl, payload)
+    return payload
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    client.open()
     yield
     await client.close()
 
 
-app = FastAPI(title="Kalshi Trading Dashboard API", lifespan=lifespan)
+app = FastAPI(title="Kalshi Trading Dashboard API", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=[o.strip() for o in settings.cors_origins.split(",") if o.strip()],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "DELETE"],
+    allow_headers=["Content-Type", "Authorization"],
+    max_age=86400,  # Let browsers cache preflights for a day
 )
 
 
@@ -108,6 +230,11 @@ class OrderRequest(BaseModel):
     no_price: Optional[int] = None
 
 
+def _json(content, cache_control: str = "no-store") -> ORJSONResponse:
+    """Return an already JSON-ready payload directly, skipping FastAPI's jsonable_encoder pass."""
+    return ORJSONResponse(content=content, headers={"Cache-Control": cache_control})
+
+
 @app.get("/health")
 async def health():
     return {"status": "healthy"}
@@ -123,6 +250,15 @@ async def get_balance():
         raise HTTPException(500, str(e))
 
 
+@app.post("/api/cache/invalidate")
+async def invalidate_cache():
+    """Drop cached series/market/event responses and /api/events results so the next request refetches."""
+    cleared = len(_get_cache) + len(_events_cache)
+    _get_cache.clear()
+    _events_cache.clear()
+    return {"cleared": cleared}
+
+
 @app.get("/api/categories")
 async def get_categories():
     """Get categories."""
@@ -131,196 +267,349 @@ async def get_categories():
     }
 
 
-@app.get("/api/events")
+# Shared read-only default for nested .get() chains
+_EMPTY: dict = {}
+
+# Sort keys, bound once at import instead of a fresh lambda per sort
+_by_ticker = itemgetter("ticker")  # Every grouped event dict has a ticker
+
+
+def _by_close(m: dict) -> str:
+    return m.get("close_time") or ""
+
+
+def _by_market_count_desc(e: dict) -> int:
+    return -len(e.get("markets") or ())
+
+# Fallback event title: everything before the first "say" in a market title
+_SAY_RE = re.compile(r"(.*?)say", re.IGNORECASE)
+
+
+# Process-wide cap on concurrent fan-out requests, to stay inside Kalshi rate limits
+KALSHI_SEM = asyncio.Semaphore(10)
+
+
+async def _guarded(make_coro):
+    """Await make_coro() under KALSHI_SEM, returning any exception instead of raising it.
+
+    The coroutine is only created once the semaphore is held, so a task
+    cancelled while waiting leaves no never-awaited coroutine behind.
+    """
+    try:
+        async with KALSHI_SEM:
+            return await make_coro()
+    except Exception as e:
+        return e
+
+
+async def fan_out(make_coros) -> list:
+    """Run Kalshi requests concurrently under KALSHI_SEM, one per zero-argument factory.
+
+    Each result is either the return value or the exception raised, so one
+    failed request doesn't cancel its siblings in the TaskGroup.
+    """
+    async with asyncio.TaskGroup() as tg:
+        tasks = [tg.create_task(_guarded(make_coro)) for make_coro in make_coros]
+    return [task.result() for task in tasks]
+
+
+# Final /api/events results: (category, search, limit, series_ticker) -> (computed_at, result)
+EVENTS_TTL = 15.0
+_events_cache: dict[tuple, tuple[float, dict]] = {}
+_events_inflight: dict[tuple, asyncio.Task] = {}
+# Keys come from query params, so bound the cache like _get_cache
+EVENTS_CACHE_MAX = 1024
+
+
+def _prune_events_cache(now: float):
+    """Drop expired entries, then the oldest ones if still over EVENTS_CACHE_MAX."""
+    for key in [k for k, (computed_at, _) in _events_cache.items() if now - computed_at >= EVENTS_TTL]:
+        del _events_cache[key]
+    while len(_events_cache) >= EVENTS_CACHE_MAX:
+        del _events_cache[next(iter(_events_cache))]
+
+
+@app.get("/api/events", response_class=ORJSONResponse, response_model=None)
 async def get_events(category: Optional[str] = None, search: Optional[str] = None, limit: int = 50, series_ticker: Optional[str] = None):
-    """Get markets grouped by event. If series_ticker provided, fetch that series directly."""
+    """Get markets grouped by event. If series_ticker provided, fetch that series directly.
+
+    Results are shared across clients for EVENTS_TTL seconds, and concurrent
+    requests for the same key wait on a single in-flight fan-out.
+    """
+    key = (category, search or "", limit, series_ticker)
+    hit = _events_cache.get(key)
+    if hit and time.monotonic() - hit[0] < EVENTS_TTL:
+        return _json(hit[1], f"public, max-age={int(EVENTS_TTL)}")
+
+    task = _events_inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_load_events(category, search, limit, series_ticker))
+        _events_inflight[key] = task
+
+        def _done(t: asyncio.Task):
+            _events_inflight.pop(key, None)
+            if not t.cancelled() and t.exception() is None:
+                now = time.monotonic()
+                if len(_events_cache) >= EVENTS_CACHE_MAX:
+                    _prune_events_cache(now)
+                _events_cache[key] = (now, t.result())
+
+        task.add_done_callback(_done)
+
+    # Shield so one client disconnecting doesn't cancel the fetch for the others
+    return _json(await asyncio.shield(task), f"public, max-age={int(EVENTS_TTL)}")
+
+
+async def _load_events(category: Optional[str], search: Optional[str], limit: int, series_ticker: Optional[str]) -> dict:
     try:
         all_items = []
-        seen_events = set()
 
         # If series_ticker is provided, query that series directly
         if series_ticker:
-            markets_result = await client.request("GET", "/markets", params={"series_ticker": series_ticker, "limit": 200})
+            markets_result = await cached_get("/markets", {"series_ticker": series_ticker, "limit": 200}, SERIES_MARKETS_TTL)
             markets = markets_result.get("markets", [])
 
             # Group markets by event_ticker
             events_map = {}
             for m in markets:
-                if m.get("status") != "active":
+                get = m.get
+                if get("status") != "active":
                     continue
 
-                event_ticker = m.get("event_ticker", "")
+                event_ticker = get("event_ticker")
                 if not event_ticker:
                     continue
 
-                if event_ticker not in events_map:
+                event_data = events_map.get(event_ticker)
+                if event_data is None:
                     # Extract team names from title for hockey games
-                    title = m.get("title", "")
-                    events_map[event_ticker] = {
+                    event_data = events_map[event_ticker] = {
                         "ticker": event_ticker,
-                        "title": title,
-                        "category": m.get("category", "Sports"),
+                        "title": get("title", ""),
+                        "category": get("category", "Sports"),
                         "type": "event",
                         "markets": []
                     }
-                events_map[event_ticker]["markets"].append(m)
-
-            # Fetch actual event titles
-            for event_ticker, event_data in events_map.items():
-                if len(event_data["markets"]) > 0:
-                    try:
-                        event_result = await client.request("GET", f"/events/{event_ticker}")
-                        event_info = event_result.get("event", {})
-                        event_data["title"] = event_info.get("title", event_data["title"])
-                    except:
-                        pass
-
-                    if search and search.lower() not in event_data["title"].lower():
-                        continue
-
-                    event_data["markets"].sort(key=lambda m: m.get("close_time", ""))
-                    all_items.append(event_data)
-                    seen_events.add(event_ticker)
-
-            all_items.sort(key=lambda e: e.get("ticker", ""))
+                event_data["markets"].append(m)
+
+            # Fetch actual event titles concurrently; the search matches against them
+            needle = search.lower() if search else ""
+            event_results = await fan_out(
+                partial(cached_get, f"/events/{event_ticker}", ttl=EVENT_TTL) for event_ticker in events_map
+            )
+            for event_data, event_result in zip(events_map.values(), event_results):
+                if not isinstance(event_result, Exception):
+                    event_info = event_result.get("event", {})
+                    event_data["title"] = event_info.get("title", event_data["title"])
+
+                if needle and needle not in event_data["title"].lower():
+                    continue
+
+                event_data["markets"].sort(key=_by_close)
+                all_items.append(event_data)
+
+            all_items.sort(key=_by_ticker)
             return {"events": all_items[:limit]}
 
         # Original behavior: Fetch Mentions series
-        series_result = await client.request("GET", "/series", params={"limit": 100, "category": "Mentions"})
+        series_result = await cached_get("/series", {"limit": 100, "category": "Mentions"}, SERIES_TTL)
+        series_list = series_result.get("series", [])
+
+        # Start markets fetches for every series at once, then consume them in series order.
+        # Each series' event titles are requested as soon as its markets arrive, overlapping
+        # with the series still in flight.
+        markets_tasks = [
+            asyncio.create_task(_guarded(partial(
+                cached_get, "/markets", {"series_ticker": s.get("ticker"), "limit": 200}, SERIES_MARKETS_TTL
+            )))
+            for s in series_list
+        ]
+        title_tasks: dict[str, asyncio.Task] = {}
+        try:
+            events_map = await _group_series_events(markets_tasks, title_tasks, search, limit)
+            event_results = await asyncio.gather(*title_tasks.values())
+        finally:
+            # Series past the limit, or everything if we were cancelled
+            for task in markets_tasks:
+                task.cancel()
+            for task in title_tasks.values():
+                task.cancel()
+
+        # Every grouped event has at least one market, so no emptiness check is needed
+        needle = search.lower() if search else ""
+        for event_data, event_result in zip(events_map.values(), event_results):
+            if isinstance(event_result, Exception):
+                title = event_data["markets"][0].get("title", "")
+                say = _SAY_RE.match(title)
+                event_data["title"] = say.group(1) + "say...?" if say else title
+            else:
+                event_info = event_result.get("event", {})
+                event_data["title"] = event_info.get("title", event_data["title"])
 
-        for series in series_result.get("series", []):
-            s_ticker = series.get("ticker")
+            if needle and needle not in event_data["title"].lower():
+                continue
 
-            # Get markets for this series
-            try:
-                markets_result = await client.request("GET", "/markets", params={"series_ticker": s_ticker, "limit": 200})
-                markets = markets_result.get("markets", [])
-
-                # Group markets by event_ticker
-                events_map = {}
-                for m in markets:
-                    if m.get("status") != "active" or m.get("mve_collection_ticker"):
-                        continue
-
-                    event_ticker = m.get("event_ticker", "")
-                    if not event_ticker or event_ticker in seen_events:
-                        continue
-
-                    if event_ticker not in events_map:
-                        events_map[event_ticker] = {
-                            "ticker": event_ticker,
-                            "title": m.get("title", ""),
-                            "category": "Mentions",
-                            "type": "event",
-                            "markets": []
-                        }
-                    events_map[event_ticker]["markets"].append(m)
-
-                # Fetch actual event titles and add to results
-                for event_ticker, event_data in events_map.items():
-                    if len(event_data["markets"]) > 0:
-                        try:
-                            event_result = await client.request("GET", f"/events/{event_ticker}")
-                            event_info = event_result.get("event", {})
-                            event_data["title"] = event_info.get("title", event_data["title"])
-                        except:
-                            first_market = event_data["markets"][0]
-                            event_data["title"] = first_market.get("title", "").split("say")[0] + "say...?" if "say" in first_market.get("title", "").lower() else first_market.get("title", "")
-
-                        if search and search.lower() not in event_data["title"].lower():
-                            continue
-
-                        event_data["markets"].sort(key=lambda m: m.get("close_time", ""))
-                        event_data["markets"] = event_data["markets"][:20]
-                        all_items.append(event_data)
-                        seen_events.add(event_ticker)
-
-            except:
-                pass
-
-            if len(all_items) >= limit:
-                break
+            # Only the 20 soonest-closing markets are kept, so skip the full sort
+            event_data["markets"] = heapq.nsmallest(20, event_data["markets"], key=_by_close)
+            all_items.append(event_data)
 
-        all_items.sort(key=lambda e: -len(e.get("markets", [])))
+        all_items.sort(key=_by_market_count_desc)
         return {"events": all_items[:limit]}
     except Exception as e:
         raise HTTPException(500, str(e))
 
 
-@app.get("/api/event/{ticker}")
+async def _group_series_events(
+    markets_tasks: list[asyncio.Task], title_tasks: dict[str, asyncio.Task], search: Optional[str], limit: int
+) -> dict:
+    """Group Mentions markets by event_ticker, in series order.
+
+    Starts an /events title fetch in title_tasks for each new event as its
+    series is grouped.
+    """
+    events_map = {}
+    for markets_task in markets_tasks:
+        markets_result = await markets_task
+        if isinstance(markets_result, Exception):
+            continue
+
+        for m in markets_result.get("markets", []):
+            get = m.get
+            if get("status") != "active" or get("mve_collection_ticker"):
+                continue
+
+            event_ticker = get("event_ticker")
+            if not event_ticker:
+                continue
+
+            event_data = events_map.get(event_ticker)
+            if event_data is None:
+                event_data = events_map[event_ticker] = {
+                    "ticker": event_ticker,
+                    "title": get("title", ""),
+                    "category": "Mentions",
+                    "type": "event",
+                    "markets": []
+                }
+                title_tasks[event_ticker] = asyncio.create_task(
+                    _guarded(partial(cached_get, f"/events/{event_ticker}", ttl=EVENT_TTL))
+                )
+            event_data["markets"].append(m)
+
+        # Without a search filter every event is kept, so stop once we have enough
+        if not search and len(events_map) >= limit:
+            break
+    return events_map
+
+
+def _active_sorted(markets: list, exclude_mve: bool = False) -> list:
+    """Active markets sorted by close time, optionally dropping multivariate collection markets."""
+    return sorted(
+        (
+            m for m in markets
+            if m.get("status") == "active" and not (exclude_mve and m.get("mve_collection_ticker"))
+        ),
+        key=_by_close,
+    )
+
+
+async def _get_event_with_markets(ticker: str) -> dict:
+    """Event info with nested markets, shared by the event page and the bot's toggle."""
+    result = await cached_get(f"/events/{ticker}", {"with_nested_markets": True}, DETAIL_TTL)
+    return result.get("event", _EMPTY)
+
+
+@app.get("/api/event/{ticker}", response_class=ORJSONResponse, response_model=None)
 async def get_event_detail(ticker: str, type: str = "event"):
     """Get full event or series details with all active markets."""
     try:
         if type == "series":
-            # Fetch series markets
-            series_result = await client.request("GET", f"/series/{ticker}")
-            series = series_result.get("series", {})
-
-            markets_result = await client.request("GET", "/markets", params={"series_ticker": ticker, "limit": 200})
+            # Fetch series info and its markets concurrently
+            series_result, markets_result = await asyncio.gather(
+                cached_get(f"/series/{ticker}", ttl=SERIES_TTL),
+                cached_get("/markets", {"series_ticker": ticker, "limit": 200}, DETAIL_TTL),
+            )
+            info = series_result.get("series", {})
             markets = markets_result.get("markets", [])
-
-            active_markets = [
-                m for m in markets
-                if m.get("status") == "active" and not m.get("mve_collection_ticker")
-            ]
-            active_markets.sort(key=lambda m: m.get("close_time", ""))
-
-            return {
-                "ticker": ticker,
-                "title": series.get("title"),
-                "category": series.get("category"),
-                "markets": active_markets
-            }
+            exclude_mve = True
         else:
-            # Fetch event markets
-            result = await client.request("GET", f"/events/{ticker}", params={"with_nested_markets": True})
-            event = result.get("event", {})
-
-            markets = event.get("markets", [])
-            active_markets = [m for m in markets if m.get("status") == "active"]
-            active_markets.sort(key=lambda m: m.get("close_time", ""))
-
-            return {
-                "ticker": event.get("ticker"),
-                "title": event.get("title"),
-                "category": event.get("category"),
-                "markets": active_markets
-            }
+            # Fetch event with nested markets
+            info = await _get_event_with_markets(ticker)
+            markets = info.get("markets", [])
+            ticker = info.get("ticker")
+            exclude_mve = False
+
+        return _json({
+            "ticker": ticker,
+            "title": info.get("title"),
+            "category": info.get("category"),
+            "markets": _active_sorted(markets, exclude_mve)
+        }, "public, max-age=5")
     except Exception as e:
         raise HTTPException(500, str(e))
 
 
-@app.get("/api/markets/{ticker}/orderbook")
+@app.get("/api/markets/{ticker}/orderbook", response_class=ORJSONResponse, response_model=None)
 async def get_orderbook(ticker: str, depth: int = 10):
     try:
-        return await client.request("GET", f"/markets/{ticker}/orderbook", params={"depth": depth})
+        # Polled every second by the dashboard, so never let a cache serve it
+        return _json(await client.request("GET", f"/markets/{ticker}/orderbook", params={"depth": depth}))
     except Exception as e:
         raise HTTPException(500, str(e))
 
 
-@app.get("/api/markets/{ticker}/history")
+# Larger batch requests are rejected with a 422
+MAX_ORDERBOOK_TICKERS = 100
+
+
+class OrderbooksRequest(BaseModel):
+    tickers: list[str] = Field(max_length=MAX_ORDERBOOK_TICKERS)
+    depth: int = 10
+
+
+@app.post("/api/orderbooks", response_class=ORJSONResponse, response_model=None)
+async def get_orderbooks(req: OrderbooksRequest):
+    """Fetch orderbooks for many tickers at once, under KALSHI_SEM like other fan-outs."""
+    results = await fan_out(
+        partial(client.request, "GET", f"/markets/{t}/orderbook", params={"depth": req.depth})
+        for t in req.tickers
+    )
+    return _json({
+        "orderbooks": {
+            t: (r if not isinstance(r, Exception) else None) for t, r in zip(req.tickers, results)
+        }
+    })
+
+
+# Default history ranges by period_interval: 1min=2hrs, 60min=7days, otherwise 30days
+_HISTORY_WINDOWS = {1: 2 * 60 * 60, 60: 7 * 24 * 60 * 60}
+_HISTORY_WINDOW_DEFAULT = 30 * 24 * 60 * 60
+
+
+def _candle_row(c: dict) -> dict:
+    """One Kalshi candlestick in the dashboard's flat history shape."""
+    get = c.get
+    return {
+        "ts": get("end_period_ts", 0),
+        "yes_price": (get("price") or _EMPTY).get("close", 0),
+        "yes_bid": (get("yes_bid") or _EMPTY).get("close", 0),
+        "yes_ask": (get("yes_ask") or _EMPTY).get("close", 0),
+        "volume": get("volume", 0),
+        "open_interest": get("open_interest", 0)
+    }
+
+
+@app.get("/api/markets/{ticker}/history", response_class=ORJSONResponse, response_model=None)
 async def get_market_history(ticker: str, min_ts: Optional[int] = None, max_ts: Optional[int] = None, period_interval: int = 60):
     """Get price history/candlesticks for a market. period_interval in minutes (1, 60, 1440)."""
     try:
         # Parse series_ticker from market ticker (e.g., KXNFLMENTION-SB26-WIND -> KXNFLMENTION-SB26)
-        parts = ticker.rsplit("-", 1)
-        if len(parts) == 2:
-            series_ticker = parts[0]
-        else:
-            series_ticker = ticker
+        head, sep, _ = ticker.rpartition("-")
+        series_ticker = head if sep else ticker
 
         # Set default time range based on period_interval
         end_ts = max_ts or int(time.time())
-        if min_ts:
-            start_ts = min_ts
-        else:
-            # Default ranges: 1min=2hrs, 60min=7days, 1440min=30days
-            if period_interval == 1:
-                start_ts = end_ts - (2 * 60 * 60)
-            elif period_interval == 60:
-                start_ts = end_ts - (7 * 24 * 60 * 60)
-            else:
-                start_ts = end_ts - (30 * 24 * 60 * 60)
+        start_ts = min_ts or end_ts - _HISTORY_WINDOWS.get(period_interval, _HISTORY_WINDOW_DEFAULT)
 
         params = {
             "period_interval": period_interval,
@@ -330,23 +619,13 @@ async def get_market_history(ticker: str, min_ts: Optional[int] = None, max_ts:
         result = await client.request("GET", f"/series/{series_ticker}/markets/{ticker}/candlesticks", params=params)
 
         # Transform to simpler format for frontend
-        candlesticks = result.get("candlesticks", [])
-        history = []
-        for c in candlesticks:
-            history.append({
-                "ts": c.get("end_period_ts", 0),
-                "yes_price": c.get("price", {}).get("close", 0),
-                "yes_bid": c.get("yes_bid", {}).get("close", 0),
-                "yes_ask": c.get("yes_ask", {}).get("close", 0),
-                "volume": c.get("volume", 0),
-                "open_interest": c.get("open_interest", 0)
-            })
-        return {"history": history}
+        history = list(map(_candle_row, result.get("candlesticks", [])))
+        return _json({"history": history}, "public, max-age=30")
     except Exception as e:
         raise HTTPException(500, str(e))
 
 
-@app.get("/api/markets/{ticker}/trades")
+@app.get("/api/markets/{ticker}/trades", response_class=ORJSONResponse, response_model=None)
 async def get_market_trades(ticker: str, limit: int = 100, min_ts: Optional[int] = None, max_ts: Optional[int] = None):
     """Get recent public trades for a market."""
     try:
@@ -355,16 +634,16 @@ async def get_market_trades(ticker: str, limit: int = 100, min_ts: Optional[int]
             params["min_ts"] = min_ts
         if max_ts:
             params["max_ts"] = max_ts
-        return await client.request("GET", "/markets/trades", params=params)
+        return _json(await client.request("GET", "/markets/trades", params=params), "public, max-age=5")
     except Exception as e:
         raise HTTPException(500, str(e))
 
 
-@app.get("/api/markets/{ticker}")
+@app.get("/api/markets/{ticker}", response_class=ORJSONResponse, response_model=None)
 async def get_market(ticker: str):
     """Get market details."""
     try:
-        return await client.request("GET", f"/markets/{ticker}")
+        return _json(await cached_get(f"/markets/{ticker}", ttl=DETAIL_TTL), "public, max-age=5")
     except Exception as e:
         raise HTTPException(500, str(e))
 
@@ -372,18 +651,8 @@ async def get_market(ticker: str):
 @app.post("/api/orders")
 async def create_order(order: OrderRequest):
     try:
-        data = {
-            "ticker": order.ticker,
-            "side": order.side,
-            "action": order.action,
-            "count": order.count,
-            "type": order.type,
-        }
-        if order.yes_price:
-            data["yes_price"] = order.yes_price
-        if order.no_price:
-            data["no_price"] = order.no_price
-        return await client.request("POST", "/portfolio/orders", json_data=data)
+        # Unset yes_price/no_price default to None and drop out here
+        return await client.request("POST", "/portfolio/orders", json_data=order.model_dump(exclude_none=True))
     except Exception as e:
         raise HTTPException(500, str(e))
 
@@ -404,38 +673,54 @@ async def cancel_order(order_id: str):
         raise HTTPException(500, str(e))
 
 
-@app.get("/api/positions")
+@app.get("/api/positions", response_class=ORJSONResponse, response_model=None)
 async def get_positions():
     try:
         result = await client.request("GET", "/portfolio/positions")
         positions = result.get("market_positions", [])
         active_positions = [p for p in positions if p.get("position", 0) != 0]
 
+        # Hydrate titles with one bulk /markets call instead of one call per position
+        tickers = [p["ticker"] for p in active_positions if p.get("ticker")]
+        markets_by_ticker = {}
+        if tickers:
+            try:
+                markets_result = await cached_get(
+                    "/markets", {"tickers": ",".join(tickers), "limit": len(tickers)}, MARKET_TTL
+                )
+                markets_by_ticker = {m.get("ticker"): m for m in markets_result.get("markets", [])}
+            except Exception:
+                # Fall back to per-ticker lookups, run concurrently under KALSHI_SEM
+                results = await fan_out(partial(cached_get, f"/markets/{t}", ttl=MARKET_TTL) for t in tickers)
+                markets_by_ticker = {
+                    t: r.get("market", {}) for t, r in zip(tickers, results) if not isinstance(r, Exception)
+                }
+
         for pos in active_positions:
             ticker = pos.get("ticker")
             if ticker:
-                try:
-                    market = await client.request("GET", f"/markets/{ticker}")
-                    pos["market_title"] = market.get("market", {}).get("title", ticker)
-                    pos["yes_sub_title"] = market.get("market", {}).get("yes_sub_title", "")
-                except:
+                market = markets_by_ticker.get(ticker)
+                if market is not None:
+                    pos["market_title"] = market.get("title", ticker)
+                    pos["yes_sub_title"] = market.get("yes_sub_title", "")
+                else:
                     pos["market_title"] = ticker
 
-        return {"market_positions": active_positions}
+        return _json({"market_positions": active_positions})
     except Exception as e:
         raise HTTPException(500, str(e))
 
 
 # ============== MOMENTUM BOT ==============
 
-import asyncio
+from collections import deque
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
 
 
 @dataclass
 class BotTrade:
-    timestamp: str
+    timestamp: int  # Wall-clock ns; formatted only when status is served
     ticker: str
     event_ticker: str
     side: str  # "yes" or "no"
@@ -456,19 +741,32 @@ class MomentumBot:
         self.cancel_delay: float = 3.0  # seconds before auto-cancelling unfilled orders
         self.enabled_events: set = set()  # event_tickers with bot enabled
         self.event_markets: dict = {}  # event_ticker -> list of market tickers
-        self.price_history: dict = {}  # market_ticker -> list of (timestamp, price)
+        # market_ticker -> (timestamps, prices): parallel typed arrays, timestamps increasing
+        self.price_history: dict[str, tuple[array, array]] = {}
         self.pending_orders: dict = {}  # order_id -> (timestamp, ticker)
-        self.trades: list = []
+        self.trades: deque[BotTrade] = deque(maxlen=100)  # Oldest trades fall off the left
         self._task: Optional[asyncio.Task] = None
         self._running: bool = False
+        # Streamed orderbooks: market_ticker -> {"yes": {price: qty}, "no": {price: qty}}
+        self.books: dict[str, dict[str, dict[int, int]]] = {}
+        self._ws = None
+        self._ws_task: Optional[asyncio.Task] = None
+        self._ws_subscribed: set[str] = set()
+        # Kalshi unsubscribes by subscription id: market_ticker -> sid, filled from
+        # the "subscribed" reply matched to its command id
+        self._ws_sids: dict[str, int] = {}
+        self._ws_pending: dict[int, list[str]] = {}
+        self._ws_cmd_id = 0
+        self._fetch_sem = asyncio.Semaphore(16)  # Concurrent orderbook polls per tick
 
     async def toggle_event(self, event_ticker: str, enable: bool):
         """Enable or disable bot for a specific event (game)."""
         if enable:
             # Get markets for this event
             try:
-                markets_result = await client.request("GET", "/markets", params={"event_ticker": event_ticker, "limit": 50})
-                markets = markets_result.get("markets", [])
+                # Same cached request as the event page, which the UI has usually just loaded
+                event = await _get_event_with_markets(event_ticker)
+                markets = event.get("markets", [])
                 active_tickers = [m["ticker"] for m in markets if m.get("status") == "active"]
 
                 if active_tickers:
@@ -479,15 +777,21 @@ class MomentumBot:
                     # Start the loop if not running
                     if not self._running:
                         await self._start_loop()
+                    else:
+                        await self._ws_subscribe(active_tickers)
             except Exception as e:
                 print(f"Error enabling bot for {event_ticker}: {e}")
         else:
             self.enabled_events.discard(event_ticker)
-            self.event_markets.pop(event_ticker, None)
-            # Clear price history for this event's markets
+            # Unsubscribe so re-enabling sends a fresh subscribe and gets a new snapshot
+            await self._ws_unsubscribe(self.event_markets.pop(event_ticker, []))
+            # Clear price history and streamed books for this event's markets
             for ticker in list(self.price_history.keys()):
                 if ticker.startswith(event_ticker):
                     del self.price_history[ticker]
+            for ticker in list(self.books.keys()):
+                if ticker.startswith(event_ticker):
+                    del self.books[ticker]
             print(f"🛑 Bot disabled for {event_ticker}")
 
             # Stop loop if no events enabled
@@ -500,6 +804,8 @@ class MomentumBot:
             return
         self._running = True
         self._task = asyncio.create_task(self._run_loop())
+        if client._private_key is not None:
+            self._ws_task = asyncio.create_task(self._run_ws())
         print("🤖 Momentum bot loop started")
 
     async def _stop_loop(self):
@@ -512,8 +818,113 @@ class MomentumBot:
             except asyncio.CancelledError:
                 pass
             self._task = None
+        if self._ws_task:
+            self._ws_task.cancel()
+            try:
+                await self._ws_task
+            except asyncio.CancelledError:
+                pass
+            self._ws_task = None
+        self.books.clear()
         print("🛑 Momentum bot loop stopped")
 
+    async def _run_ws(self):
+        """Stream orderbook snapshots and deltas for monitored markets, reconnecting on error."""
+        while self._running:
+            try:
+                async with websockets.connect(settings.kalshi_ws_url, extra_headers=client.ws_headers()) as ws:
+                    self._ws = ws
+                    self._ws_subscribed.clear()
+                    self._ws_sids.clear()
+                    self._ws_pending.clear()
+                    await self._ws_subscribe([t for tickers in self.event_markets.values() for t in tickers])
+                    async for message in ws:
+                        self._handle_ws_message(orjson.loads(message))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Bot websocket error: {e}")
+            finally:
+                self._ws = None
+                # Books can't be trusted across a gap; poll REST until fresh snapshots arrive
+                self.books.clear()
+            await asyncio.sleep(1.0)
+
+    async def _ws_subscribe(self, tickers: list[str]):
+        new = [t for t in tickers if t not in self._ws_subscribed]
+        if self._ws is None or not new:
+            return
+        self._ws_subscribed.update(new)
+        self._ws_cmd_id += 1
+        self._ws_pending[self._ws_cmd_id] = new
+        await self._ws.send(orjson.dumps({
+            "id": self._ws_cmd_id,
+            "cmd": "subscribe",
+            "params": {"channels": ["orderbook_delta"], "market_tickers": new},
+        }).decode())  # Text frame, as Kalshi expects
+
+    async def _ws_unsubscribe(self, tickers: list[str]):
+        """Drop tickers from their subscriptions and forget them as subscribed."""
+        by_sid: dict[int, list[str]] = {}
+        for ticker in tickers:
+            self._ws_subscribed.discard(ticker)
+            sid = self._ws_sids.pop(ticker, None)
+            if sid is not None:
+                by_sid.setdefault(sid, []).append(ticker)
+        if self._ws is None:
+            return
+        for sid, sid_tickers in by_sid.items():
+            self._ws_cmd_id += 1
+            await self._ws.send(orjson.dumps({
+                "id": self._ws_cmd_id,
+                "cmd": "update_subscription",
+                "params": {"sids": [sid], "market_tickers": sid_tickers, "action": "delete_markets"},
+            }).decode())
+
+    def _handle_ws_message(self, data: dict):
+        msg_type = data.get("type")
+        msg = data.get("msg") or _EMPTY
+        ticker = msg.get("market_ticker")
+        if msg_type == "subscribed":
+            for t in self._ws_pending.pop(data.get("id"), ()):
+                # Skip tickers disabled before the reply arrived
+                if t in self._ws_subscribed:
+                    self._ws_sids[t] = msg.get("sid")
+        elif msg_type == "orderbook_snapshot":
+            if not any(ticker in tickers for tickers in self.event_markets.values()):
+                return
+            self.books[ticker] = {
+                "yes": {p: q for p, q in msg.get("yes") or ()},
+                "no": {p: q for p, q in msg.get("no") or ()},
+            }
+        elif msg_type == "orderbook_delta":
+            book = self.books.get(ticker)
+            if book is None:
+                return
+            levels = book.get(msg.get("side"))
+            if levels is None:
+                return
+            price = msg["price"]
+            qty = levels.get(price, 0) + msg["delta"]
+            if qty > 0:
+                levels[price] = qty
+            else:
+                levels.pop(price, None)
+
+    def _top_of_book(self, ticker: str) -> Optional[dict]:
+        """The streamed book for ticker in the REST depth=1 shape, or None if not streaming."""
+        book = self.books.get(ticker)
+        if book is None:
+            return None
+        top = {}
+        for side, levels in book.items():
+            if levels:
+                price = max(levels)
+                top[side] = [[price, levels[price]]]
+            else:
+                top[side] = []
+        return {"orderbook": top}
+
     async def _run_loop(self):
         """Main bot loop."""
         while self._running and self.enabled_events:
@@ -523,55 +934,69 @@ class MomentumBot:
                 print(f"Bot error: {e}")
             await asyncio.sleep(self.poll_interval)
 
+    async def _fetch_top_of_book(self, ticker: str) -> dict:
+        async with self._fetch_sem:
+            return await client.request("GET", f"/markets/{ticker}/orderbook", params={"depth": 1})
+
     async def _check_prices(self):
         """Check prices for all monitored markets."""
+        monitored = [
+            (event_ticker, ticker)
+            for event_ticker in list(self.enabled_events)
+            for ticker in self.event_markets.get(event_ticker, [])
+        ]
+        # Read streamed books from memory; poll REST only for markets without one,
+        # concurrently so the loop period doesn't grow with the market count
+        orderbooks = [self._top_of_book(ticker) for _, ticker in monitored]
+        missing = [i for i, book in enumerate(orderbooks) if book is None]
+        if missing:
+            fetched = await asyncio.gather(
+                *(self._fetch_top_of_book(monitored[i][1]) for i in missing),
+                return_exceptions=True,
+            )
+            for i, book in zip(missing, fetched):
+                orderbooks[i] = book
         now = time.time()
 
-        for event_ticker in list(self.enabled_events):
-            tickers = self.event_markets.get(event_ticker, [])
-            for ticker in tickers:
-                try:
-                    orderbook = await client.request("GET", f"/markets/{ticker}/orderbook", params={"depth": 1})
-
-                    yes_bid = orderbook.get("orderbook", {}).get("yes", [[0, 0]])[0][0] if orderbook.get("orderbook", {}).get("yes") else 0
-                    yes_ask = orderbook.get("orderbook", {}).get("no", [[0, 0]])[0][0] if orderbook.get("orderbook", {}).get("no") else 100
-                    yes_ask = 100 - yes_ask if yes_ask else 100
-
-                    current_price = (yes_bid + yes_ask) // 2 if yes_bid and yes_ask else yes_bid or yes_ask
-
-                    # Initialize price history for this ticker
-                    if ticker not in self.price_history:
-                        self.price_history[ticker] = []
-
-                    # Add current price to history
-                    self.price_history[ticker].append((now, current_price))
-
-                    # Remove old entries (keep last 5 seconds of data)
-                    self.price_history[ticker] = [
-                        (ts, p) for ts, p in self.price_history[ticker]
-                        if now - ts <= 5.0
-                    ]
-
-                    # Find price from ~1 second ago
-                    target_time = now - self.lookback_seconds
-                    old_price = None
-                    for ts, p in self.price_history[ticker]:
-                        if ts <= target_time:
-                            old_price = p
-                        else:
-                            break
-
-                    # Compare to price from 1 second ago
-                    if old_price is not None:
-                        price_change = current_price - old_price
-
-                        if abs(price_change) >= self.min_price_move:
-                            await self._execute_trade(ticker, event_ticker, price_change, orderbook)
-                            # Clear history after trade to avoid repeat triggers
-                            self.price_history[ticker] = [(now, current_price)]
+        for (event_ticker, ticker), orderbook in zip(monitored, orderbooks):
+            if isinstance(orderbook, Exception):
+                print(f"Error checking {ticker}: {orderbook}")
+                continue
+            try:
+                yes_bid = orderbook.get("orderbook", {}).get("yes", [[0, 0]])[0][0] if orderbook.get("orderbook", {}).get("yes") else 0
+                yes_ask = orderbook.get("orderbook", {}).get("no", [[0, 0]])[0][0] if orderbook.get("orderbook", {}).get("no") else 100
+                yes_ask = 100 - yes_ask if yes_ask else 100
+
+                current_price = (yes_bid + yes_ask) // 2 if yes_bid and yes_ask else yes_bid or yes_ask
+
+                history = self.price_history.get(ticker)
+                if history is None:
+                    history = self.price_history[ticker] = (array("d"), array("h"))
+                ts_hist, px_hist = history
+
+                # Add current price, then drop entries older than 5 seconds
+                ts_hist.append(now)
+                px_hist.append(current_price)
+                stale = bisect_left(ts_hist, now - 5.0)
+                if stale:
+                    del ts_hist[:stale]
+                    del px_hist[:stale]
+
+                # Price from ~lookback_seconds ago: the last sample at or before target_time
+                old = bisect_right(ts_hist, now - self.lookback_seconds)
+
+                # Compare to price from 1 second ago
+                if old:
+                    price_change = current_price - px_hist[old - 1]
+
+                    if abs(price_change) >= self.min_price_move:
+                        await self._execute_trade(ticker, event_ticker, price_change, orderbook)
+                        # Clear history after trade to avoid repeat triggers
+                        del ts_hist[:-1]
+                        del px_hist[:-1]
 
-                except Exception as e:
-                    print(f"Error checking {ticker}: {e}")
+            except Exception as e:
+                print(f"Error checking {ticker}: {e}")
 
     async def _execute_trade(self, ticker: str, event_ticker: str, price_change: int, orderbook: dict):
         """Execute a momentum trade. Bid+1, auto-cancel after delay if not filled."""
@@ -580,7 +1005,8 @@ class MomentumBot:
             side = "yes"
             yes_levels = orderbook.get("orderbook", {}).get("yes", [])
             if yes_levels:
-                highest_bid = max(level[0] for level in yes_levels)
+                # Levels ascend by price, so the best bid is last (the only one at depth=1)
+                highest_bid = yes_levels[-1][0]
                 order_price = highest_bid + 1
             else:
                 return
@@ -589,7 +1015,7 @@ class MomentumBot:
             side = "no"
             no_levels = orderbook.get("orderbook", {}).get("no", [])
             if no_levels:
-                highest_bid = max(level[0] for level in no_levels)
+                highest_bid = no_levels[-1][0]
                 order_price = highest_bid + 1
             else:
                 return
@@ -600,7 +1026,7 @@ class MomentumBot:
             return
 
         trade = BotTrade(
-            timestamp=datetime.now().isoformat(),
+            timestamp=time.time_ns(),
             ticker=ticker,
             event_ticker=event_ticker,
             side=side,
@@ -643,8 +1069,6 @@ class MomentumBot:
             print(f"❌ Bot trade failed: {e}")
 
         self.trades.append(trade)
-        if len(self.trades) > 100:
-            self.trades = self.trades[-100:]
 
     async def _auto_cancel_order(self, order_id: str, ticker: str):
         """Cancel order after delay if still resting."""
@@ -708,7 +1132,7 @@ async def get_bot_status():
         },
         "recent_trades": [
             {
-                "timestamp": t.timestamp,
+                "timestamp": datetime.fromtimestamp(t.timestamp / 1e9, tz=timezone.utc).isoformat(),
                 "ticker": t.ticker,
                 "event_ticker": t.event_ticker,
                 "side": t.side,
@@ -717,7 +1141,7 @@ async def get_bot_status():
                 "trigger": t.trigger_price_change,
                 "status": t.status
             }
-            for t in momentum_bot.trades[-20:]
+            for t in islice(momentum_bot.trades, max(0, len(momentum_bot.trades) - 20), None)
         ],
         "total_trades": len(momentum_bot.trades)
     }
@@ -1,16 +1,23 @@
+import asyncio
 import base64
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import padding
 
+# Built once and shared by every signature instead of per request
+_SHA256 = hashes.SHA256()
+_PSS = padding.PSS(mgf=padding.MGF1(_SHA256), salt_length=padding.PSS.MAX_LENGTH)
+
 
 class KalshiAuth:
     def __init__(self, api_key: str, private_key_path: str = "", private_key_content: str = ""):
         self.api_key = api_key
-        self.private_key = self._load_private_key(private_key_path, private_key_content)
+        key_data = self._read_key_data(private_key_path, private_key_content)
+        self.private_key = serialization.load_pem_private_key(key_data, password=None)
 
-    def _load_private_key(self, path: str, content: str):
+    def _read_key_data(self, path: str, content: str) -> bytes:
         if content:
             # Key passed directly (e.g., from environment variable)
             # Handle escaped newlines from env vars
@@ -22,26 +29,26 @@ class KalshiAuth:
         else:
             raise ValueError("Either private_key_path or private_key_content must be provided")
 
-        return serialization.load_pem_private_key(key_data, password=None)
+        return key_data
 
-    def get_auth_headers(self, method: str, path: str) -> dict:
-        timestamp = str(int(time.time() * 1000))
+    def sign(self, method: str, path: str, timestamp: str) -> str:
+        """Base64 signature of timestamp + method + path."""
         message = f"{timestamp}{method}{path}"
+        return base64.b64encode(self.private_key.sign(message.encode(), _PSS, _SHA256)).decode()
 
-        signature = self.private_key.sign(
-            message.encode(),
-            padding.PSS(
-                mgf=padding.MGF1(hashes.SHA256()),
-                salt_length=padding.PSS.MAX_LENGTH
-            ),
-            hashes.SHA256()
-        )
+    def make_sign_pool(self, max_workers: int = 2) -> ThreadPoolExecutor:
+        """Thread pool for signing bursts off the event loop; cryptography releases the GIL while signing."""
+        return ThreadPoolExecutor(max_workers, thread_name_prefix="kalshi-sign")
 
-        signature_b64 = base64.b64encode(signature).decode()
+    async def sign_in_pool(self, pool: ThreadPoolExecutor, method: str, path: str, timestamp: str) -> str:
+        """Same as sign(), computed in a pool from make_sign_pool()."""
+        return await asyncio.get_running_loop().run_in_executor(pool, self.sign, method, path, timestamp)
 
+    def get_auth_headers(self, method: str, path: str) -> dict:
+        timestamp = str(int(time.time() * 1000))
         return {
             "KALSHI-ACCESS-KEY": self.api_key,
-            "KALSHI-ACCESS-SIGNATURE": signature_b64,
+            "KALSHI-ACCESS-SIGNATURE": self.sign(method, path, timestamp),
             "KALSHI-ACCESS-TIMESTAMP": timestamp,
             "Content-Type": "application/json"
         }
@@ -15,6 +15,20 @@ class Settings(BaseSettings):
         return self.kalshi_api_key or self.api_key_id
 
     demo_mode: bool = False  # Set to True for testing without API
+    market_cache_ttl: float = 2.0  # Seconds to reuse fetched market/orderbook data
+    orderbook_depth: int = 10  # Best ask levels returned per side
+    orderbook_max_staleness: float = 5.0  # Seconds before a book without a live ws subscription falls back to REST
+    related_cache_ttl: float = 3600.0  # Seconds to reuse a resolved opposing-market pair
+    kalshi_fanout: int = 10  # Max concurrent Kalshi requests per fan-out
+    max_games: int = 500  # Oldest games are evicted past this
+
+    # Kalshi HTTP client tuning
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 40
+    http_keepalive_expiry: float = 30.0  # Seconds an idle connection is kept open
+    http_timeout: float = 5.0
+    http_connect_timeout: float = 2.0
+    http2: bool = True
 
     @property
     def effective_private_key(self) -> str:
@@ -0,0 +1,138 @@
+import asyncio
+from collections import Counter, OrderedDict
+from itertools import islice
+from typing import Optional
+from models import GameConfig, GameSide
+from config import get_settings
+
+
+class GameStore:
+    """In-memory game storage with a ticker reference-count index.
+
+    Mutations are serialized with a lock. The add/update/remove methods
+    return the tickers that became referenced or unreferenced so callers
+    only subscribe/unsubscribe on 0 -> 1 and 1 -> 0 transitions.
+
+    At most max_games are kept; adding past the cap evicts the least
+    recently created or updated game.
+    """
+
+    def __init__(self, max_games: int = 500):
+        self.max_games = max_games
+        self._games: OrderedDict[str, GameConfig] = OrderedDict()
+        self._ticker_refs: Counter[str] = Counter()
+        self._lock = asyncio.Lock()
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self._games
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def get(self, game_id: str) -> Optional[GameConfig]:
+        return self._games.get(game_id)
+
+    def values(self):
+        return self._games.values()
+
+    def page(self, cursor: Optional[str] = None, limit: Optional[int] = None) -> list[GameConfig]:
+        """Games after the `cursor` game id (from the start if None), up to `limit`.
+
+        Raises KeyError if the cursor game has been deleted or evicted, so an
+        unknown cursor can't pass for the end of the list.
+        """
+        games = iter(self._games.values())
+        if cursor is not None:
+            if cursor not in self._games:
+                raise KeyError(cursor)
+            for game in games:
+                if game.id == cursor:
+                    break
+        return list(islice(games, limit))
+
+    def tickers(self):
+        """Unique tickers referenced by any stored game."""
+        return self._ticker_refs.keys()
+
+    def _ref(self, ticker: str, added: list[str]):
+        if self._ticker_refs[ticker] == 0:
+            added.append(ticker)
+        self._ticker_refs[ticker] += 1
+
+    def _unref(self, ticker: str, removed: list[str]):
+        self._ticker_refs[ticker] -= 1
+        if self._ticker_refs[ticker] <= 0:
+            del self._ticker_refs[ticker]
+            removed.append(ticker)
+
+    async def add(self, game: GameConfig) -> tuple[list[str], list[str]]:
+        """Store a game, evicting the oldest past the cap.
+
+        Returns (added_tickers, removed_tickers).
+        """
+        added: list[str] = []
+        removed: list[str] = []
+        async with self._lock:
+            self._games[game.id] = game
+            self._games.move_to_end(game.id)
+            self._ref(game.side_a.ticker, added)
+            self._ref(game.side_b.ticker, added)
+
+            while len(self._games) > self.max_games:
+                _, evicted = self._games.popitem(last=False)
+                self._unref(evicted.side_a.ticker, removed)
+                self._unref(evicted.side_b.ticker, removed)
+
+        return [t for t in added if t not in removed], [t for t in removed if t not in added]
+
+    async def update(
+        self,
+        game_id: str,
+        name: Optional[str] = None,
+        side_a: Optional[GameSide] = None,
+        side_b: Optional[GameSide] = None,
+    ) -> tuple[Optional[GameConfig], list[str], list[str]]:
+        """Update a game in place. Returns (game, added_tickers, removed_tickers)."""
+        added: list[str] = []
+        removed: list[str] = []
+        async with self._lock:
+            game = self._games.get(game_id)
+            if game is None:
+                return None, added, removed
+
+            self._games.move_to_end(game_id)
+            if name:
+                game.name = name
+            if side_a:
+                self._ref(side_a.ticker, added)
+                self._unref(game.side_a.ticker, removed)
+                game.side_a = side_a
+            if side_b:
+                self._ref(side_b.ticker, added)
+                self._unref(game.side_b.ticker, removed)
+                game.side_b = side_b
+
+        # A ticker swapped out and back in within one update is still referenced
+        return game, [t for t in added if t not in removed], [t for t in removed if t not in added]
+
+    async def remove(self, game_id: str) -> Optional[list[str]]:
+        """Delete a game. Returns tickers no longer referenced, or None if missing."""
+        removed: list[str] = []
+        async with self._lock:
+            game = self._games.pop(game_id, None)
+            if game is None:
+                return None
+            self._unref(game.side_a.ticker, removed)
+            self._unref(game.side_b.ticker, removed)
+        return removed
+
+
+# Singleton
+_store: Optional[GameStore] = None
+
+
+def get_game_store() -> GameStore:
+    global _store
+    if _store is None:
+        _store = GameStore(max_games=get_settings().max_games)
+    return _store
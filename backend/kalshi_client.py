@@ -1,12 +1,18 @@
 import httpx
 import asyncio
-import json
+import time
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Callable
 import websockets
 from auth import KalshiAuth
 from config import get_settings
 
 
+# Concurrent REST requests beyond which signing moves to the thread pool
+SIGN_OFFLOAD_THRESHOLD = 5
+
+
 class KalshiClient:
     def __init__(self):
         settings = get_settings()
@@ -17,35 +23,99 @@ class KalshiClient:
             private_key_path=settings.kalshi_private_key_path,
             private_key_content=settings.effective_private_key
         )
+        self._access_key = settings.effective_api_key
+        self._sign_prefix = "/trade-api/v2"
+        self._http_limits = httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        )
+        self._http_timeout = httpx.Timeout(settings.http_timeout, connect=settings.http_connect_timeout)
+        self._http2 = settings.http2
+        self._fanout = settings.kalshi_fanout
+        self._sign_pool: Optional[ThreadPoolExecutor] = None
+        self._in_flight = 0  # REST requests currently being signed or awaited
         self._http_client: Optional[httpx.AsyncClient] = None
         self._ws: Optional[websockets.WebSocketClientProtocol] = None
         self._ws_callbacks: dict[str, Callable] = {}
+        # Outgoing ws commands, sent by a writer task that merges queued subscribes
+        self._ws_outbox: asyncio.Queue = asyncio.Queue()
+        self._ws_cmd_id = 0
+        # Kalshi unsubscribes by subscription id. Each orderbook subscribe is
+        # single-channel, so a ticker maps to one sid, taken from the "subscribed"
+        # reply matched to its command id
+        self._ws_sids: dict[str, int] = {}
+        self._ws_pending: dict[int, list[str]] = {}  # Subscribe command id -> tickers awaiting the reply
+        self._ws_unwanted: set[str] = set()  # Unsubscribed while their subscribe awaited its reply
+        self._connected = asyncio.Event()  # Set while a websocket is open
 
-    async def get_http_client(self) -> httpx.AsyncClient:
-        if self._http_client is None or self._http_client.is_closed:
-            self._http_client = httpx.AsyncClient(timeout=30.0)
-        return self._http_client
+    def open(self):
+        """Create the pooled HTTP client; called once from the app lifespan."""
+        # One pooled HTTP/2 connection multiplexes concurrent requests;
+        # retries only cover failed connection attempts
+        transport = httpx.AsyncHTTPTransport(
+            http2=self._http2,
+            limits=self._http_limits,
+            retries=1,
+        )
+        self._sign_pool = self.auth.make_sign_pool()
+        self._http_client = httpx.AsyncClient(
+            base_url=self.base_url,
+            transport=transport,
+            timeout=self._http_timeout,
+            headers={"Content-Type": "application/json"},
+        )
 
     async def _request(self, method: str, path: str, data: dict = None) -> dict:
-        client = await self.get_http_client()
-        url = f"{self.base_url}{path}"
-        headers = self.auth.get_auth_headers(method, f"/trade-api/v2{path}")
-
-        if method == "GET":
-            response = await client.get(url, headers=headers)
-        elif method == "POST":
-            response = await client.post(url, headers=headers, json=data)
-        elif method == "DELETE":
-            response = await client.delete(url, headers=headers)
-        else:
-            raise ValueError(f"Unsupported method: {method}")
+        body = await self._request_bytes(method, path, data)
+        # orjson decodes straight from bytes, skipping the str decode of response.json()
+        return orjson.loads(body) if body else {}
 
+    async def _request_bytes(self, method: str, path: str, data: dict = None) -> bytes:
+        """Send a signed request and return the raw response body."""
+        if method not in ("GET", "POST", "DELETE"):
+            raise ValueError(f"Unsupported method: {method}")
+        self._in_flight += 1
+        try:
+            ts = str(time.time_ns() // 1_000_000)
+            sign_path = self._sign_prefix + path
+            if self._in_flight > SIGN_OFFLOAD_THRESHOLD and self._sign_pool:
+                # Bursts (e.g. seeding many books) sign on pool threads so the loop
+                # keeps reading ws frames; single requests avoid the thread hop
+                signature = await self.auth.sign_in_pool(self._sign_pool, method, sign_path, ts)
+            else:
+                signature = self.auth.sign(method, sign_path, ts)
+            headers = {
+                "KALSHI-ACCESS-KEY": self._access_key,
+                "KALSHI-ACCESS-SIGNATURE": signature,
+                "KALSHI-ACCESS-TIMESTAMP": ts,
+            }
+            content = orjson.dumps(data) if data is not None else None
+            response = await self._http_client.request(method, path, headers=headers, content=content)
+        finally:
+            self._in_flight -= 1
         response.raise_for_status()
-        return response.json() if response.text else {}
+        return response.content
 
     async def get_orderbook(self, ticker: str) -> dict:
         return await self._request("GET", f"/markets/{ticker}/orderbook")
 
+    async def get_orderbooks(self, tickers: list[str]) -> dict[str, dict | Exception]:
+        """Fetch many orderbooks concurrently over the pooled client.
+
+        Kalshi has no multi-ticker orderbook endpoint, so this fans out one
+        request per ticker, at most kalshi_fanout at a time. Failed fetches
+        map to their exception.
+        """
+        sem = asyncio.Semaphore(self._fanout)
+
+        async def one(ticker: str) -> dict:
+            async with sem:
+                return await self.get_orderbook(ticker)
+
+        results = await asyncio.gather(*(one(t) for t in tickers), return_exceptions=True)
+        return dict(zip(tickers, results))
+
     async def get_market(self, ticker: str) -> dict:
         return await self._request("GET", f"/markets/{ticker}")
 
@@ -88,7 +158,12 @@ class KalshiClient:
     async def get_balance(self) -> dict:
         return await self._request("GET", "/portfolio/balance")
 
-    async def connect_websocket(self, on_message: Callable):
+    async def connect_websocket(self, on_messages: Callable):
+        """Stream decoded ws messages to on_messages in batches.
+
+        A reader task queues frames as they arrive; each call gets every
+        frame that queued up while the previous batch was being handled.
+        """
         headers = self.auth.get_auth_headers("GET", "/trade-api/ws/v2")
         ws_headers = [
             ("KALSHI-ACCESS-KEY", headers["KALSHI-ACCESS-KEY"]),
@@ -96,37 +171,145 @@ class KalshiClient:
             ("KALSHI-ACCESS-TIMESTAMP", headers["KALSHI-ACCESS-TIMESTAMP"]),
         ]
 
-        self._ws = await websockets.connect(self.ws_url, extra_headers=ws_headers)
+        # Frames are many small JSON messages: skip per-frame inflate, and let
+        # larger bursts drain per read
+        self._ws = await websockets.connect(
+            self.ws_url,
+            extra_headers=ws_headers,
+            compression=None,
+            max_size=2**22,
+            read_limit=2**20,
+            write_limit=2**20,
+        )
+        self._connected.set()
+
+        frames: asyncio.Queue = asyncio.Queue()
 
-        async for message in self._ws:
-            data = json.loads(message)
-            await on_message(data)
+        async def read():
+            try:
+                async for message in self._ws:
+                    frames.put_nowait(message)
+            finally:
+                frames.put_nowait(None)  # Connection closed
 
-    async def subscribe(self, channels: list[str], tickers: list[str]):
-        if self._ws:
-            msg = {
-                "id": 1,
-                "cmd": "subscribe",
-                "params": {
-                    "channels": channels,
-                    "market_tickers": tickers
+        reader = asyncio.create_task(read())
+        writer = asyncio.create_task(self._write_ws(self._ws))
+        try:
+            closed = False
+            while not closed:
+                batch = [await frames.get()]
+                while not frames.empty():
+                    batch.append(frames.get_nowait())
+                if batch[-1] is None:
+                    closed = True
+                    batch.pop()
+                if batch:
+                    messages = [orjson.loads(message) for message in batch]
+                    self._track_subscriptions(messages)
+                    await on_messages(messages)
+            await reader  # Re-raise whatever closed the connection
+        finally:
+            reader.cancel()
+            writer.cancel()
+            self._ws = None
+            self._connected.clear()
+            # Commands queued for this socket don't carry over; each connect resubscribes in full
+            while not self._ws_outbox.empty():
+                self._ws_outbox.get_nowait()
+            # Subscription ids only live as long as their connection
+            self._ws_sids.clear()
+            self._ws_pending.clear()
+            self._ws_unwanted.clear()
+
+    @property
+    def connected(self) -> bool:
+        return self._connected.is_set()
+
+    async def wait_connected(self):
+        await self._connected.wait()
+
+    def _track_subscriptions(self, messages: list[dict]):
+        """Record the sid of each acknowledged subscribe, by ticker."""
+        for data in messages:
+            if data.get("type") != "subscribed":
+                continue
+            tickers = self._ws_pending.pop(data.get("id"), None)
+            if not tickers:
+                continue
+            sid = data["msg"]["sid"]
+            for ticker in tickers:
+                self._ws_sids[ticker] = sid
+            # Tickers dropped before the reply came can only be removed now that their sid is known
+            unwanted = [t for t in tickers if t in self._ws_unwanted]
+            if unwanted:
+                self._ws_unwanted.difference_update(unwanted)
+                self.unsubscribe(unwanted)
+
+    async def _write_ws(self, ws):
+        """Send queued commands in order of effect: removals first, then
+        subscribes merged per channel set into one frame each."""
+        while True:
+            commands = [await self._ws_outbox.get()]
+            while not self._ws_outbox.empty():
+                commands.append(self._ws_outbox.get_nowait())
+
+            subscribes: dict[tuple[str, ...], dict[str, None]] = {}
+            deletes: dict[int, list[str]] = {}
+            for cmd, channels, tickers in commands:
+                if cmd == "subscribe":
+                    subscribes.setdefault(channels, {}).update(dict.fromkeys(tickers))
+                    self._ws_unwanted.difference_update(tickers)
+                    continue
+                awaiting = {t for pending in self._ws_pending.values() for t in pending}
+                for ticker in tickers:
+                    # A subscribe still in this batch is simply never sent
+                    for pending in subscribes.values():
+                        pending.pop(ticker, None)
+                    sid = self._ws_sids.pop(ticker, None)
+                    if sid is not None:
+                        deletes.setdefault(sid, []).append(ticker)
+                    elif ticker in awaiting:
+                        self._ws_unwanted.add(ticker)
+
+            for sid, tickers in deletes.items():
+                self._ws_cmd_id += 1
+                msg = {
+                    "id": self._ws_cmd_id,
+                    "cmd": "update_subscription",
+                    "params": {"sids": [sid], "market_tickers": tickers, "action": "delete_markets"}
                 }
-            }
-            await self._ws.send(json.dumps(msg))
+                await ws.send(orjson.dumps(msg).decode())  # Text frame, as Kalshi expects
+
+            for channels, tickers in subscribes.items():
+                if not tickers:
+                    continue
+                self._ws_cmd_id += 1
+                self._ws_pending[self._ws_cmd_id] = list(tickers)
+                msg = {
+                    "id": self._ws_cmd_id,
+                    "cmd": "subscribe",
+                    "params": {
+                        "channels": list(channels),
+                        "market_tickers": list(tickers)
+                    }
+                }
+                await ws.send(orjson.dumps(msg).decode())
+
+    def subscribe(self, channels: list[str], tickers: list[str]):
+        """Queue a subscribe for the writer task; a no-op while disconnected."""
+        if self._ws:
+            self._ws_outbox.put_nowait(("subscribe", tuple(channels), tickers))
+
+    def unsubscribe(self, tickers: list[str]):
+        """Queue removal of tickers from their subscriptions; a no-op while disconnected."""
+        if self._ws:
+            self._ws_outbox.put_nowait(("unsubscribe", None, tickers))
 
     async def close(self):
         if self._http_client:
             await self._http_client.aclose()
+        if self._sign_pool:
+            self._sign_pool.shutdown(wait=False)
         if self._ws:
             await self._ws.close()
 
-
-# Singleton instance
-_client: Optional[KalshiClient] = None
-
-
-def get_kalshi_client() -> KalshiClient:
-    global _client
-    if _client is None:
-        _client = KalshiClient()
-    return _client
@@ -1,37 +1,72 @@
+import logging
+import queue
 from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from api import router
-from orderbook import get_orderbook_manager
+from orderbook import OrderBookManager
+from kalshi_client import KalshiClient
 from config import get_settings
 
 
+def _start_logging() -> QueueListener:
+    """Log through a queue so handler I/O runs on a listener thread, not the event loop."""
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
+
+
+def _stop_logging(listener: QueueListener):
+    listener.stop()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, QueueHandler) and handler.queue is listener.queue:
+            root.removeHandler(handler)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     settings = get_settings()
+    log_listener = _start_logging()
 
     if settings.demo_mode:
         print("🎮 Running in DEMO MODE - no real API connections")
         print("📱 Open http://localhost:8000 in your browser")
+        app.state.kalshi = None
+        app.state.book_manager = None
         yield
     else:
         # Startup: Initialize WebSocket connection
         print("🔌 Connecting to Kalshi API...")
-        manager = get_orderbook_manager()
+        client = KalshiClient()
+        client.open()
+        manager = OrderBookManager(client)
+        app.state.kalshi = client
+        app.state.book_manager = manager
         await manager.start_websocket()
         yield
         # Shutdown: Clean up
         await manager.stop()
+        await client.close()
+    _stop_logging(log_listener)
 
 
 app = FastAPI(
     title="Kalshi Fast Trader",
     description="Fast trade execution for Kalshi prediction markets",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS
@@ -63,4 +98,5 @@ async def root():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # One worker: the orderbook websocket and in-memory books live in this process
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools", ws="websockets", workers=1)
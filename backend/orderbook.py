@@ -1,36 +1,65 @@
 import asyncio
-from typing import Optional
+import logging
+import time
+from bisect import bisect_left, bisect_right, insort
+from itertools import accumulate
+from typing import Any, Optional
 from dataclasses import dataclass, field
-from kalshi_client import get_kalshi_client
+from kalshi_client import KalshiClient
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+
+@dataclass(slots=True)
 class OrderBookLevel:
     price: int  # In cents
     quantity: int
 
 
-@dataclass
+@dataclass(slots=True)
 class OrderBook:
     ticker: str
-    bids: list[OrderBookLevel] = field(default_factory=list)
-    asks: list[OrderBookLevel] = field(default_factory=list)
-
-    @property
-    def best_bid(self) -> Optional[int]:
-        return self.bids[0].price if self.bids else None
-
-    @property
-    def best_ask(self) -> Optional[int]:
-        return self.asks[0].price if self.asks else None
+    # price -> quantity, with each side's prices kept sorted ascending alongside
+    bids: dict[int, int] = field(default_factory=dict)
+    asks: dict[int, int] = field(default_factory=dict)
+    bid_prices: list[int] = field(default_factory=list)
+    ask_prices: list[int] = field(default_factory=list)
+    updated_at: float = 0.0  # time.monotonic() of the last snapshot/delta
+    # Kalshi subscription id and its sequence number for the last ws message
+    # applied; seq only orders messages within one sid
+    feed_sid: int = 0
+    feed_seq: int = 0
+    # Best prices, refreshed from the sorted price lists after every write
+    best_bid: Optional[int] = None
+    best_ask: Optional[int] = None
+    # get_asks result and cumulative ask quantities by price, rebuilt on the first read after a write
+    asks_view: Optional[tuple[OrderBookLevel, ...]] = field(default=None, repr=False)
+    ask_depth: Optional[list[int]] = field(default=None, repr=False)
+
+    def refresh_best(self):
+        self.best_bid = self.bid_prices[-1] if self.bid_prices else None
+        self.best_ask = self.ask_prices[0] if self.ask_prices else None
+
+
+# Seconds to collect newly subscribed tickers into a single ws subscribe
+SUBSCRIBE_BATCH_DELAY = 0.05
 
 
 class OrderBookManager:
-    def __init__(self):
+    def __init__(self, client: KalshiClient):
+        self._client = client
         self._books: dict[str, OrderBook] = {}
         self._subscribed_tickers: set[str] = set()
         self._running = False
         self._ws_task: Optional[asyncio.Task] = None
+        self._pending_ws_tickers: set[str] = set()
+        # Tickers subscribed on the current ws connection, by either subscribe path
+        self._ws_tickers: set[str] = set()
+        self._ws_flush_handle: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def client(self) -> KalshiClient:
+        return self._client
 
     def get_book(self, ticker: str) -> Optional[OrderBook]:
         return self._books.get(ticker)
@@ -43,117 +72,268 @@ class OrderBookManager:
         book = self._books.get(ticker)
         return book.best_bid if book else None
 
-    def get_asks(self, ticker: str) -> list[OrderBookLevel]:
-        """Get all ask levels sorted by price ascending (best first)."""
+    def _is_live(self, book: OrderBook) -> bool:
+        """Whether the book follows an open ws subscription, so silence means no changes."""
+        return bool(book.feed_sid) and book.ticker in self._ws_tickers and self._client.connected
+
+    def get_orderbook_snapshot(self, ticker: str, max_age: Optional[float] = None) -> Optional[dict]:
+        """Return the local book in Kalshi's REST shape ({"yes": [[price, qty]], "no": [...]}).
+
+        Returns None if the ticker has no populated book. A book fed by a live
+        ws subscription is current however long since its last delta; any
+        other book is also None once older than max_age seconds.
+        """
+        book = self._books.get(ticker)
+        if not book or not book.updated_at:
+            return None
+        if (
+            max_age is not None
+            and time.monotonic() - book.updated_at > max_age
+            and not self._is_live(book)
+        ):
+            return None
+        bids, asks = book.bids, book.asks
+        return {
+            "yes": [[price, bids[price]] for price in reversed(book.bid_prices)],
+            # Yes asks are stored converted from No bids: no_bid = 100 - yes_ask
+            "no": [[100 - price, asks[price]] for price in book.ask_prices],
+        }
+
+    def apply_snapshot(self, ticker: str, orderbook: dict[str, Any]) -> None:
+        """Seed a subscribed book from a REST orderbook response.
+
+        Ignored while the book follows a live ws subscription, which may be
+        newer than the REST response.
+        """
+        book = self._books.get(ticker)
+        if book and self._is_live(book):
+            return
+        self._update_book_from_snapshot(ticker, orderbook)
+
+    def get_asks(self, ticker: str) -> tuple[OrderBookLevel, ...]:
+        """Get all ask levels sorted by price ascending (best first).
+
+        The tuple is shared between reads until the book next changes.
+        """
         book = self._books.get(ticker)
         if not book:
-            return []
-        # Sort asks ascending (lowest/best price first)
-        sorted_asks = sorted(book.asks, key=lambda x: x.price)
-        return sorted_asks
+            return ()
+        if book.asks_view is None:
+            asks = book.asks
+            book.asks_view = tuple(OrderBookLevel(price=price, quantity=asks[price]) for price in book.ask_prices)
+        return book.asks_view
 
     def get_available_contracts(self, ticker: str, limit_price: int) -> int:
         """Get total contracts available at or below the limit price."""
-        asks = self.get_asks(ticker)
-        total = 0
-        for level in asks:
-            if level.price <= limit_price:
-                total += level.quantity
-            else:
-                break  # Asks are sorted, no need to continue
-        return total
+        book = self._books.get(ticker)
+        if not book:
+            return 0
+        prices = book.ask_prices
+        count = bisect_right(prices, limit_price)
+        if not count:
+            return 0
+        if book.ask_depth is None:
+            # Running totals over the sorted asks turn each query into one lookup
+            asks = book.asks
+            book.ask_depth = list(accumulate(asks[price] for price in prices))
+        return book.ask_depth[count - 1]
 
     async def subscribe(self, ticker: str):
-        if ticker not in self._subscribed_tickers:
+        await self.subscribe_many([ticker])
+
+    async def subscribe_many(self, tickers: list[str]):
+        """Track new tickers, seeding their books with one concurrent burst of REST fetches."""
+        new = [t for t in dict.fromkeys(tickers) if t not in self._subscribed_tickers]
+        if not new:
+            return
+        for ticker in new:
             self._subscribed_tickers.add(ticker)
             self._books[ticker] = OrderBook(ticker=ticker)
 
-            # Fetch initial orderbook via REST
-            client = get_kalshi_client()
-            try:
-                data = await client.get_orderbook(ticker)
-                self._update_book_from_snapshot(ticker, data)
-            except Exception as e:
-                print(f"Failed to fetch orderbook for {ticker}: {e}")
+        # Fetch initial orderbooks via REST
+        for ticker, data in (await self._client.get_orderbooks(new)).items():
+            if isinstance(data, Exception):
+                logger.warning("Failed to fetch orderbook for %s: %s", ticker, data)
+            else:
+                self._update_book_from_snapshot(ticker, data.get("orderbook") or {})
 
-    def _update_book_from_snapshot(self, ticker: str, data: dict):
+        # Stream deltas for tickers added after the websocket started
+        if self._running:
+            for ticker in new:
+                self._queue_ws_subscribe(ticker)
+
+    def _queue_ws_subscribe(self, ticker: str):
+        """Collect tickers for SUBSCRIBE_BATCH_DELAY and subscribe them in one command."""
+        self._pending_ws_tickers.add(ticker)
+        if self._ws_flush_handle is None:
+            self._ws_flush_handle = asyncio.get_running_loop().call_later(
+                SUBSCRIBE_BATCH_DELAY, self._flush_ws_subscribes
+            )
+
+    def _flush_ws_subscribes(self):
+        self._ws_flush_handle = None
+        # Skip tickers unsubscribed while they waited, or already covered by a reconnect
+        tickers = [
+            t for t in self._pending_ws_tickers
+            if t in self._subscribed_tickers and t not in self._ws_tickers
+        ]
+        self._pending_ws_tickers.clear()
+        if tickers:
+            self._ws_tickers.update(tickers)
+            self._client.subscribe(["orderbook_delta"], tickers)
+
+    async def unsubscribe(self, ticker: str):
+        # Stop Kalshi's feed before forgetting the ticker, so a later re-add
+        # doesn't run alongside a still-live subscription
+        if ticker in self._ws_tickers:
+            self._client.unsubscribe([ticker])
+        self._subscribed_tickers.discard(ticker)
+        self._ws_tickers.discard(ticker)
+        self._books.pop(ticker, None)
+
+    def _update_book_from_snapshot(
+        self, ticker: str, data: dict[str, Any], feed_sid: int = 0, feed_seq: int = 0
+    ) -> None:
+        """Replace a book's levels; feed_sid/feed_seq come from the ws message (0 for REST)."""
         book = self._books.get(ticker)
         if not book:
             return
+        # A snapshot older than deltas already applied from the same subscription
+        # would roll the book back. A new subscription restarts seq at 1.
+        if feed_sid == book.feed_sid and 0 < feed_seq < book.feed_seq:
+            return
 
-        # Parse yes side (what we care about for buying YES contracts)
-        book.bids = [
-            OrderBookLevel(price=level[0], quantity=level[1])
-            for level in data.get("yes", {}).get("bids", [])
-        ]
-        book.asks = [
-            OrderBookLevel(price=level[0], quantity=level[1])
-            for level in data.get("yes", {}).get("asks", [])
-        ]
-
-    def _update_book_from_delta(self, ticker: str, data: dict):
+        # Kalshi books only list bids. Yes bids are our bids; a No bid at p
+        # is a Yes ask at 100 - p (what we care about for buying YES contracts)
+        # Levels arrive as [price, qty] pairs, which dict() consumes directly in C
+        book.bids = dict(data.get("yes") or ())
+        book.asks = {100 - price: qty for price, qty in data.get("no") or ()}
+        book.bid_prices = sorted(book.bids)
+        book.ask_prices = sorted(book.asks)
+        book.asks_view = book.ask_depth = None
+        book.refresh_best()
+        book.updated_at = time.monotonic()
+        if feed_sid:
+            book.feed_sid, book.feed_seq = feed_sid, feed_seq
+
+    def _update_book_from_deltas(
+        self, ticker: str, sides: dict[str, dict[int, int]], feed_sid: int = 0, feed_seq: int = 0
+    ) -> None:
+        """Apply summed relative deltas, {"yes"|"no": {price: delta}}, to one book."""
         book = self._books.get(ticker)
         if not book:
             return
 
-        # Handle delta updates
-        if "yes" in data:
-            if "bids" in data["yes"]:
-                self._apply_delta(book.bids, data["yes"]["bids"])
-            if "asks" in data["yes"]:
-                self._apply_delta(book.asks, data["yes"]["asks"])
-
-    def _apply_delta(self, levels: list[OrderBookLevel], deltas: list):
-        for price, qty in deltas:
-            # Find existing level
-            existing = next((l for l in levels if l.price == price), None)
-            if qty == 0:
-                if existing:
-                    levels.remove(existing)
-            elif existing:
-                existing.quantity = qty
+        for side, deltas in sides.items():
+            # Kalshi deltas are relative quantity changes at a single price level
+            if side == "yes":
+                levels, prices = book.bids, book.bid_prices
+                updates = [(price, levels.get(price, 0) + delta) for price, delta in deltas.items()]
+            elif side == "no":
+                levels, prices = book.asks, book.ask_prices
+                updates = [(100 - price, levels.get(100 - price, 0) + delta) for price, delta in deltas.items()]
+                book.asks_view = book.ask_depth = None
             else:
-                levels.append(OrderBookLevel(price=price, quantity=qty))
-
-        # Keep sorted (bids descending, asks ascending handled by caller)
-        levels.sort(key=lambda x: x.price, reverse=True)
-
-    async def _handle_ws_message(self, data: dict):
-        msg_type = data.get("type")
-
-        if msg_type == "orderbook_snapshot":
-            ticker = data.get("market_ticker")
-            if ticker:
-                self._update_book_from_snapshot(ticker, data.get("orderbook", {}))
-
-        elif msg_type == "orderbook_delta":
-            ticker = data.get("market_ticker")
-            if ticker:
-                self._update_book_from_delta(ticker, data)
+                continue
+            self._apply_delta(levels, prices, updates)
+        book.refresh_best()
+        book.updated_at = time.monotonic()
+        if feed_sid and feed_sid != book.feed_sid:
+            book.feed_sid, book.feed_seq = feed_sid, feed_seq
+        else:
+            book.feed_seq = max(book.feed_seq, feed_seq)
+
+    def _apply_delta(self, levels: dict[int, int], prices: list[int], deltas: list[tuple[int, int]]) -> None:
+        """Set absolute (price, qty) pairs on one side; qty <= 0 removes the level.
+
+        prices is the side's ascending price list, updated by bisection
+        instead of re-sorting.
+        """
+        for price, qty in deltas:
+            if qty > 0:
+                if price not in levels:
+                    insort(prices, price)
+                levels[price] = qty
+            elif levels.pop(price, None) is not None:
+                del prices[bisect_left(prices, price)]
+
+    async def _handle_ws_messages(self, batch: list[dict[str, Any]]) -> None:
+        """Fold a batch of ws messages per ticker, then apply each book's changes once.
+
+        A snapshot replaces everything before it for that ticker; deltas for
+        the same side and price are summed. Deltas from a subscription other
+        than the one the book follows are dropped.
+        """
+        snapshots: dict[str, tuple[dict[str, Any], int, int]] = {}
+        deltas: dict[str, dict[str, dict[int, int]]] = {}
+        delta_feeds: dict[str, tuple[int, int]] = {}
+        book_sids: dict[str, int] = {}  # Sid each ticker follows as of this point in the batch
+
+        for data in batch:
+            msg_type = data.get("type")
+            msg = data.get("msg", data)
+            ticker = msg.get("market_ticker")
+            if not ticker:
+                continue
+
+            feed_sid = data.get("sid") or 0
+            feed_seq = data.get("seq") or 0
+            if msg_type == "orderbook_snapshot":
+                snapshots[ticker] = (msg, feed_sid, feed_seq)
+                book_sids[ticker] = feed_sid
+                deltas.pop(ticker, None)
+
+            elif msg_type == "orderbook_delta":
+                price = msg.get("price")
+                delta = msg.get("delta")
+                if price is None or not delta:
+                    continue
+                book_sid = book_sids.get(ticker)
+                if book_sid is None:
+                    book = self._books.get(ticker)
+                    book_sid = book_sids[ticker] = book.feed_sid if book else 0
+                if feed_sid and book_sid and feed_sid != book_sid:
+                    continue
+                side = deltas.setdefault(ticker, {}).setdefault(msg.get("side"), {})
+                side[price] = side.get(price, 0) + delta
+                delta_feeds[ticker] = (feed_sid, feed_seq)
+
+        for ticker, (msg, feed_sid, feed_seq) in snapshots.items():
+            self._update_book_from_snapshot(ticker, msg, feed_sid, feed_seq)
+        for ticker, sides in deltas.items():
+            self._update_book_from_deltas(ticker, sides, *delta_feeds[ticker])
 
     async def start_websocket(self):
         if self._running:
             return
 
         self._running = True
-        client = get_kalshi_client()
+        client = self._client
 
         async def run_ws():
             while self._running:
+                subscribe = asyncio.create_task(self._subscribe_on_connect(client))
                 try:
-                    await client.connect_websocket(self._handle_ws_message)
+                    await client.connect_websocket(self._handle_ws_messages)
                 except Exception as e:
-                    print(f"WebSocket error: {e}")
+                    logger.warning("WebSocket error: %s", e)
                     await asyncio.sleep(5)  # Reconnect after delay
+                finally:
+                    subscribe.cancel()
 
         self._ws_task = asyncio.create_task(run_ws())
 
-        # Subscribe to all tickers
-        await asyncio.sleep(1)  # Wait for connection
-        if self._subscribed_tickers:
-            await client.subscribe(
+    async def _subscribe_on_connect(self, client):
+        """Subscribe every tracked ticker once the socket is open, on each (re)connect."""
+        await client.wait_connected()
+        # Subscription ids and their sequence numbers restart with each connection
+        for book in self._books.values():
+            book.feed_sid = book.feed_seq = 0
+        self._ws_tickers = set(self._subscribed_tickers)
+        if self._ws_tickers:
+            client.subscribe(
                 ["orderbook_delta"],
-                list(self._subscribed_tickers)
+                list(self._ws_tickers)
             )
 
     async def stop(self):
@@ -161,13 +341,3 @@ class OrderBookManager:
         if self._ws_task:
             self._ws_task.cancel()
 
-
-# Singleton
-_manager: Optional[OrderBookManager] = None
-
-
-def get_orderbook_manager() -> OrderBookManager:
-    global _manager
-    if _manager is None:
-        _manager = OrderBookManager()
-    return _manager
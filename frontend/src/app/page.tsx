@@ -348,11 +348,21 @@ export default function TradingDashboard() {
     } catch (e) {}
   }
 
-  // Fetch all orderbooks for selected event
+  // Fetch all orderbooks for selected event in one batched request
   const fetchEventOrderbooks = async (event: Event) => {
-    for (const market of event.markets) {
-      fetchOrderbook(market.ticker)
-    }
+    try {
+      const res = await fetch(`${API}/api/orderbooks`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ tickers: event.markets.map(m => m.ticker) }),
+      })
+      const data = await res.json()
+      const updates: Record<string, Orderbook> = {}
+      for (const [ticker, result] of Object.entries<any>(data.orderbooks || {})) {
+        if (result) updates[ticker] = result.orderbook
+      }
+      setOrderbooks(prev => ({ ...prev, ...updates }))
+    } catch (e) {}
   }
 
   // Place order